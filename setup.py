@@ -21,7 +21,8 @@ setup(
     , zip_safe = False
     , entry_points={
         'sqlalchemy.dialects': [
-            'sqlalchemy_sqlany = sqlalchemy_sqlany:base.dialect'
+            'sqlalchemy_sqlany = sqlalchemy_sqlany:base.dialect',
+            'sqlany = sqlalchemy_sqlany:base.dialect'
             ]
         }
     , license='Apache 2.0'
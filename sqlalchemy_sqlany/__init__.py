@@ -13,8 +13,18 @@ from .base import CHAR, VARCHAR, TIME, NCHAR, NVARCHAR,\
                  BIGINT, INT, INTEGER, SMALLINT, BINARY,\
                  VARBINARY, UNITEXT, UNICHAR, UNIVARCHAR,\
                  IMAGE, BIT, MONEY, SMALLMONEY, TINYINT,\
+                 UNSIGNED_BIGINT, UNSIGNED_INT, UNSIGNED_SMALLINT, DOUBLE,\
                  dialect, SQLAnyNoPrimaryKeyError
 
+from .dml import insert, Insert, merge, Merge
+from .ddl import CreateMaterializedView, DropMaterializedView, \
+    RefreshMaterializedView, AlterMaterializedView
+from .fulltext import contains
+from .routing import ReplicaRouter, RoutingSession
+from .retry import RetryPolicy
+from .lob import open_lob
+from .sequence import SequenceAllocator
+
 
 __all__ = (
     'CHAR', 'VARCHAR', 'TIME', 'NCHAR', 'NVARCHAR',
@@ -22,5 +32,10 @@ __all__ = (
     'BIGINT', 'INT', 'INTEGER', 'SMALLINT', 'BINARY',
     'VARBINARY', 'UNITEXT', 'UNICHAR', 'UNIVARCHAR',
     'IMAGE', 'BIT', 'MONEY', 'SMALLMONEY', 'TINYINT',
-    'dialect', "SQLAnyNoPrimaryKeyError"
+    'UNSIGNED_BIGINT', 'UNSIGNED_INT', 'UNSIGNED_SMALLINT', 'DOUBLE',
+    'dialect', "SQLAnyNoPrimaryKeyError",
+    'insert', 'Insert', 'merge', 'Merge', 'open_lob', 'SequenceAllocator',
+    'CreateMaterializedView', 'DropMaterializedView',
+    'RefreshMaterializedView', 'AlterMaterializedView', 'contains',
+    'ReplicaRouter', 'RoutingSession', 'RetryPolicy'
 )
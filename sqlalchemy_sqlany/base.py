@@ -3,12 +3,16 @@
 
 import operator
 import re
+import datetime
 import decimal
 import itertools
 
 import sqlanydb
 
-from sqlalchemy.sql import compiler, expression, text, column, bindparam
+from sqlalchemy.sql import compiler, crud, expression, text, column, \
+    bindparam
+from sqlalchemy.sql import elements
+from sqlalchemy.sql import util as sql_util
 from sqlalchemy.engine import default, base, reflection, url
 from sqlalchemy import types as sqltypes
 from sqlalchemy.sql import operators as sql_operators
@@ -21,6 +25,9 @@ from sqlalchemy.types import CHAR, VARCHAR, TIME, NCHAR, NVARCHAR,\
                             VARBINARY, DECIMAL, TIMESTAMP, Unicode,\
                             UnicodeText, REAL, LargeBinary
 
+from .cache import ResultCache, CachedCursor
+from .dml import Merge
+
 RESERVED_WORDS = set([
     "add", "all", "alter", "and",
     "any", "array", "as", "asc", "attach", "backup",
@@ -80,6 +87,71 @@ RESERVED_WORDS = set([
     "within", "work", "writetext", "xml"
     ])
 
+# candidate delimiters for passing string IN lists to sa_split_list()
+_SPLIT_LIST_DELIMITERS = (",", "\x1f", "\x1e", "\x1d")
+
+# textual statements which can't have modified any table
+_READ_STATEMENT_RE = re.compile(r'\s*(select|with)\b', re.I)
+
+# SQLCODEs of errors after which the connection can't be used: -85
+# communication error, -100 server not found, -101 not connected, -308
+# connection terminated, -832 connection error
+_DISCONNECT_CODES = (-85, -100, -101, -308, -832)
+
+# isolation level names accepted by set_isolation_level() and the
+# corresponding values of the isolation_level option; AUTOCOMMIT turns
+# the chained option off instead
+_ISOLATION_LEVELS = {
+    'READ UNCOMMITTED': '0',
+    'READ COMMITTED': '1',
+    'REPEATABLE READ': '2',
+    'SERIALIZABLE': '3',
+    'SNAPSHOT': 'snapshot',
+    'STATEMENT SNAPSHOT': 'statement-snapshot',
+    'READONLY STATEMENT SNAPSHOT': 'readonly-statement-snapshot',
+}
+_ISOLATION_NAMES = dict((v, k) for k, v in _ISOLATION_LEVELS.items())
+
+_OPTIMIZATION_GOALS = {'first-row': 'First-row', 'all-rows': 'All-rows'}
+
+# URL query arguments which set connection options rather than being
+# passed on to sqlanydb.connect()
+_URL_OPTION_PREFIX = 'option_'
+_URL_OPTION_KNOBS = ('max_query_tasks', 'optimization_goal')
+
+_OPTION_NAME_RE = re.compile(r'^\w+$')
+
+
+def _set_options_statement(options):
+    """A single statement setting each of the ``(name, value)`` temporary
+    options, so that any number of them take one round trip."""
+
+    statements = []
+    for name, value in options:
+        if not _OPTION_NAME_RE.match(name):
+            raise exc.ArgumentError("Invalid option name %r" % (name,))
+        statements.append("SET TEMPORARY OPTION %s = '%s'" %
+                          (name, util.text_type(value).replace("'", "''")))
+    if len(statements) == 1:
+        return statements[0]
+    return "BEGIN\n%s;\nEND" % ";\n".join(statements)
+
+
+def _batch_statement(statement, count):
+    """A batch executing `statement` `count` times and returning the
+    number of rows each execution affected as its only row."""
+
+    names = ["sqlany_rc%d" % i for i in range(1, count + 1)]
+    lines = ["BEGIN"]
+    lines.extend("DECLARE %s INTEGER;" % name for name in names)
+    for name in names:
+        lines.append("%s;" % statement)
+        lines.append("SET %s = @@rowcount;" % name)
+    lines.append("SELECT %s;" % ", ".join(names))
+    lines.append("END")
+    return "\n".join(lines)
+
+
 class SQLAnyNoPrimaryKeyError(Exception):
     """ exception that is raised when trying to load the primary keys for a 
     table that does not have any columns marked as being a primary key. 
@@ -100,11 +172,29 @@ class _SQLAnyUnitypeMixin(object):
     """these types appear to return a buffer object."""
 
     def result_processor(self, dialect, coltype):
+        encoding = dialect.encoding
+
         def process(value):
-            if value is not None:
-                return str(value)
-            else:
-                return None
+            if value is None or isinstance(value, util.text_type):
+                return value
+            # bytes() of a bytes object is the object itself, so only
+            # buffer-like values are copied before decoding
+            return bytes(value).decode(encoding)
+        return process
+
+
+class _SQLAnyBinary(sqltypes.LargeBinary):
+    def bind_processor(self, dialect):
+        if dialect.dbapi is None:
+            return None
+        DBAPIBinary = dialect.dbapi.Binary
+
+        def process(value):
+            # avoid re-wrapping (and so copying) bytes, which the driver
+            # binds as binary, and values already of its binary type
+            if value is None or isinstance(value, (bytes, DBAPIBinary)):
+                return value
+            return DBAPIBinary(value)
         return process
 
 
@@ -144,6 +234,123 @@ class IMAGE(sqltypes.LargeBinary):
     __visit_name__ = 'IMAGE'
 
 
+class UNSIGNED_BIGINT(sqltypes.BIGINT):
+    __visit_name__ = 'UNSIGNED_BIGINT'
+
+
+class UNSIGNED_INT(sqltypes.INTEGER):
+    __visit_name__ = 'UNSIGNED_INT'
+
+
+class UNSIGNED_SMALLINT(sqltypes.SMALLINT):
+    __visit_name__ = 'UNSIGNED_SMALLINT'
+
+
+class DOUBLE(sqltypes.Float):
+    __visit_name__ = 'DOUBLE'
+
+
+# sqlanydb returns temporal values as strings formatted according to the
+# date_format / time_format / timestamp_format connection options, which
+# the dialect sets to ISO formats with microseconds on connect
+_DATE_RE = re.compile(r"(\d{4})[-/](\d\d)[-/](\d\d)$")
+_TIME_RE = re.compile(r"(\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?$")
+_DATETIME_RE = re.compile(r"(\d{4})[-/](\d\d)[-/](\d\d)"
+                          r"(?:[ T](\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?)?$")
+
+_TEMPORAL_OPTIONS = [
+    ('date_format', 'YYYY-MM-DD'),
+    ('time_format', 'HH:NN:SS.SSSSSS'),
+    ('timestamp_format', 'YYYY-MM-DD HH:NN:SS.SSSSSS'),
+]
+
+
+def _microseconds(fraction):
+    return int(fraction.ljust(6, '0')) if fraction else 0
+
+
+def _cached_parser(regex, factory, size=4096):
+    """Return a result processor parsing strings matched by ``regex`` with
+    ``factory``; results are memoized since time-series data tends to
+    repeat the same dates many times."""
+
+    cache = {}
+
+    def process(value):
+        if not isinstance(value, util.string_types):
+            # None, or already converted by the driver
+            return value
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        match = regex.match(value)
+        if match is None:
+            raise ValueError("Couldn't parse %s string: %r" %
+                             (factory.__name__, value))
+        result = factory(*match.groups())
+        if len(cache) >= size:
+            cache.clear()
+        cache[value] = result
+        return result
+    return process
+
+
+def _make_date(year, month, day):
+    return datetime.date(int(year), int(month), int(day))
+
+
+def _make_time(hour, minute, second, fraction):
+    return datetime.time(int(hour), int(minute), int(second),
+                         _microseconds(fraction))
+
+
+def _make_datetime(year, month, day, hour, minute, second, fraction):
+    return datetime.datetime(int(year), int(month), int(day),
+                             int(hour or 0), int(minute or 0),
+                             int(second or 0), _microseconds(fraction))
+
+
+class _SQLAnyDate(sqltypes.Date):
+    def bind_processor(self, dialect):
+        def process(value):
+            if isinstance(value, datetime.datetime):
+                value = value.date()
+            if isinstance(value, datetime.date):
+                return value.isoformat()
+            return value
+        return process
+
+    def result_processor(self, dialect, coltype):
+        return _cached_parser(_DATE_RE, _make_date)
+
+
+class _SQLAnyTime(sqltypes.Time):
+    def bind_processor(self, dialect):
+        def process(value):
+            if isinstance(value, datetime.time):
+                return value.isoformat()
+            return value
+        return process
+
+    def result_processor(self, dialect, coltype):
+        return _cached_parser(_TIME_RE, _make_time)
+
+
+class _SQLAnyDateTime(sqltypes.DateTime):
+    def bind_processor(self, dialect):
+        def process(value):
+            if isinstance(value, datetime.datetime):
+                return value.isoformat(' ')
+            elif isinstance(value, datetime.date):
+                return value.isoformat()
+            return value
+        return process
+
+    def result_processor(self, dialect, coltype):
+        return _cached_parser(_DATETIME_RE, _make_datetime)
+
+
 class SQLAnyTypeCompiler(compiler.GenericTypeCompiler):
     def visit_large_binary(self, type_):
         return self.visit_IMAGE(type_)
@@ -181,21 +388,33 @@ class SQLAnyTypeCompiler(compiler.GenericTypeCompiler):
     def visit_UNIQUEIDENTIFIER(self, type_):
         return "UNIQUEIDENTIFIER"
 
+    def visit_UNSIGNED_BIGINT(self, type_):
+        return "UNSIGNED BIGINT"
+
+    def visit_UNSIGNED_INT(self, type_):
+        return "UNSIGNED INT"
+
+    def visit_UNSIGNED_SMALLINT(self, type_):
+        return "UNSIGNED SMALLINT"
+
+    def visit_DOUBLE(self, type_):
+        return "DOUBLE"
+
 ischema_names = {
     'bigint': BIGINT,
     'int': INTEGER,
     'integer': INTEGER,
     'smallint': SMALLINT,
     'tinyint': TINYINT,
-    'unsigned bigint': BIGINT,  # TODO: unsigned flags
-    'unsigned int': INTEGER,  # TODO: unsigned flags
-    'unsigned smallint': SMALLINT,  # TODO: unsigned flags
+    'unsigned bigint': UNSIGNED_BIGINT,
+    'unsigned int': UNSIGNED_INT,
+    'unsigned smallint': UNSIGNED_SMALLINT,
     'numeric': NUMERIC,
     'decimal': DECIMAL,
     'dec': DECIMAL,
     'float': FLOAT,
-    'double': NUMERIC,  # TODO
-    'double precision': NUMERIC,  # TODO
+    'double': DOUBLE,
+    'double precision': DOUBLE,
     'real': REAL,
     'smallmoney': SMALLMONEY,
     'money': MONEY,
@@ -232,6 +451,16 @@ ischema_names = {
 
 }
 
+# types whose reflected instances take the column width (and scale)
+_PRECISION_SCALE_TYPES = (NUMERIC, DECIMAL)
+_PRECISION_TYPES = (FLOAT,)
+_LENGTH_TYPES = (CHAR, VARCHAR, UNICHAR, UNIVARCHAR, NCHAR, NVARCHAR)
+
+# a reflected column default: an optional DEFAULT keyword, then either a
+# string literal, which is unquoted, or an expression
+_COLUMN_DEFAULT_RE = re.compile(r"\s*(?:DEFAULT\b\s*)?(?:'(.*)'|(.*?))\s*\Z",
+                                re.S | re.I)
+
 
 # converter function, only argument is the value returned
 # from the database that we want to convert
@@ -257,41 +486,249 @@ class SQLAnyInspector(reflection.Inspector):
         return self.dialect.get_table_id(self.bind, table_name, schema,
                                          info_cache=self.info_cache)
 
+    def _reflect_pk(self, table_name, schema, table, cols_by_orig_name,
+                    exclude_columns):
+        reflection.Inspector._reflect_pk(self, table_name, schema, table,
+                                         cols_by_orig_name, exclude_columns)
+        # the base Inspector doesn't carry over primary key options
+        pk_cons = self.get_pk_constraint(table_name, schema,
+                                         **table.dialect_kwargs)
+        if pk_cons.get("dialect_options"):
+            table.primary_key._validate_dialect_kwargs(
+                pk_cons["dialect_options"])
 
-class SQLAnyExecutionContext(default.DefaultExecutionContext):
-    def set_ddl_autocommit(self, connection, value):
-        """Must be implemented by subclasses to accommodate DDL executions.
+    def get_materialized_view_names(self, schema=None):
+        """Return the names of the materialized views in `schema`."""
 
-        "connection" is the raw unwrapped DBAPI connection.   "value"
-        is True or False.  when True, the connection should be configured
-        such that a DDL can take place subsequently.  when False,
-        a DDL has taken place and the connection should be resumed
-        into non-autocommit mode.
+        return self.dialect.get_materialized_view_names(
+            self.bind, schema, info_cache=self.info_cache)
+
+    def get_materialized_view_options(self, view_name, schema=None):
+        """Return the refresh type (``'immediate'`` or ``'manual'``) and
+        the time of the last refresh of materialized view `view_name` as
+        a dictionary with the keys ``refresh`` and ``last_refreshed``."""
+
+        return self.dialect.get_materialized_view_options(
+            self.bind, view_name, schema, info_cache=self.info_cache)
+
+    def get_table_stats(self, table_name, schema=None):
+        """Return the row and page counts of `table_name` as a dictionary
+        with the keys ``row_count``, ``table_pages``, ``ext_pages`` and
+        ``last_modified``.
+
+        Row counts are as of the last checkpoint and are estimates for
+        tables being modified."""
+
+        return self.dialect.get_table_stats(self.bind, table_name, schema,
+                                            info_cache=self.info_cache)
+
+    def get_column_histograms(self, table_name, schema=None):
+        """Return the optimizer statistics of the columns of `table_name`
+        as a dictionary keyed by column name.
+
+        Each value has the keys ``density``, ``distinct`` (estimated number
+        of distinct values), ``update_count``, ``last_updated`` and
+        ``histogram``, a list of ``(low_value, high_value, frequency)``
+        buckets.  Columns without statistics are omitted."""
+
+        return self.dialect.get_column_histograms(self.bind, table_name,
+                                                  schema,
+                                                  info_cache=self.info_cache)
+
+
+def _column_sequence(column):
+    """The Sequence generating the values of `column`, if any.
+
+    Sequences marked ``optional`` are ignored, as the dialect can use an
+    IDENTITY column instead."""
+
+    default = column.default
+    if default is not None and default.is_sequence and not default.optional:
+        return default
+    return None
+
+
+_TEXT_REFRESH_RE = re.compile(
+    r"(immediate|manual|auto)(?:\s+every\s+(\d+)\s+(minute|hour)s?)?$", re.I)
 
-        """
-        pass
+
+def _normalize_text_refresh(value):
+    """The canonical form of a sqlany_text_refresh option, as reflected:
+    'immediate', 'manual', 'auto', or 'auto every N hours' for a whole
+    number of hours and 'auto every N minutes' otherwise."""
+
+    match = _TEXT_REFRESH_RE.match(value.strip())
+    if match is None or (match.group(2) is not None and
+                         match.group(1).lower() != 'auto'):
+        raise exc.CompileError(
+            "sqlany_text_refresh must be 'immediate', 'manual', 'auto' or "
+            "'auto every <n> minutes|hours'; got %r" % value)
+    refresh, every, unit = match.groups()
+    if every is None:
+        return refresh.lower()
+    minutes = int(every) * (60 if unit.lower() == 'hour' else 1)
+    if minutes % 60 == 0:
+        return 'auto every %d hours' % (minutes // 60)
+    return 'auto every %d minutes' % minutes
+
+
+def _text_index_refresh(refresh_type, interval):
+    """The sqlany_text_refresh option for a reflected text index."""
+
+    if refresh_type == 1:
+        return 'manual'
+    elif refresh_type == 2:
+        if interval:
+            # the catalog keeps the interval in minutes
+            return _normalize_text_refresh('auto every %d minutes' %
+                                           interval)
+        return 'auto'
+    return 'immediate'
+
+
+def _dirty_tables(connection):
+    """Names of the tables written in the current transaction of the
+    (pooled) DBAPI connection."""
+
+    return connection.info.setdefault('sqlany_dirty_tables', set())
+
+
+class SQLAnyExecutionContext(default.DefaultExecutionContext):
+    _result_cache_key = None
+    # rows affected by each statement of an executemany() sent in batches,
+    # see SQLAnyDialect.do_executemany()
+    _rowcounts = None
 
     def pre_exec(self):
-        if self.isinsert:
-            tbl = self.compiled.statement.table
-            seq_column = tbl._autoincrement_column
-            insert_has_sequence = seq_column is not None
+        if self.isddl and not self.should_autocommit:
+            # the server commits the open transaction before and after
+            # most DDL statements whatever the autocommit setting
+            util.warn("SQL Anywhere commits the current transaction when "
+                      "DDL is executed; autocommit=False has no effect.")
 
-        if self.isddl:
-            if not self.should_autocommit:
-                raise exc.InvalidRequestError(
-                        "The SQLAny dialect only supports "
-                        "DDL in 'autocommit' mode at this time.")
+        if self.dialect._result_cache is not None:
+            self._get_cached_result(self.dialect._result_cache)
+
+    @property
+    def _is_read(self):
+        if self.compiled is not None and not isinstance(
+                self.compiled.statement, expression.TextClause):
+            return isinstance(self.compiled.statement, expression.SelectBase)
+        return bool(_READ_STATEMENT_RE.match(self.unicode_statement))
 
-            self.set_ddl_autocommit(
-                        self.root_connection.connection.connection,
-                        True)
+    @property
+    def rowcount(self):
+        if self._rowcounts is not None:
+            return sum(self._rowcounts)
+        return self.cursor.rowcount
 
     def post_exec(self):
+        if self._rowcounts is not None:
+            # the cursor is left on the batch's rowcount result
+            self.cursor.close()
+            self.cursor = self.create_cursor()
+        if self.dialect._result_cache is not None:
+            self._update_result_cache(self.dialect._result_cache)
+
+    def _get_cached_result(self, cache):
+        """Replace the cursor with a replay of a cached result, for SELECT
+        statements executed with the ``sqlany_cache`` or
+        ``sqlany_cache_ttl`` execution option."""
+
+        opts = self.execution_options
+        if not (opts.get('sqlany_cache') or opts.get('sqlany_cache_ttl')) \
+                or self.compiled is None or self.executemany \
+                or not isinstance(self.compiled.statement,
+                                  expression.SelectBase):
+            return
+
+        tables = frozenset(self._table_key(t) for t in
+                           sql_util.find_tables(self.compiled.statement))
+        dirty = _dirty_tables(self.root_connection.connection)
+        if not tables or '*' in dirty or not dirty.isdisjoint(tables):
+            # uncommitted changes on this connection must not be cached
+            return
+
+        if self.dialect.positional:
+            params = tuple(tuple(p) for p in self.parameters)
+        else:
+            params = tuple(tuple(sorted(p.items())) for p in self.parameters)
+        key = (self.statement, params)
+        entry = cache.get(key)
+        if entry is not None:
+            self.cursor.close()
+            self.cursor = CachedCursor(entry)
+        else:
+            self._result_cache_key = key
+            self._result_cache_tables = tables
+
+    def _table_key(self, table):
+        # unqualified names are taken to be in the user's own schema
+        schema = getattr(table, 'schema', None) or \
+            self.dialect.default_schema_name or ''
+        return schema.lower(), table.name.lower()
+
+    def _update_result_cache(self, cache):
+        if self._result_cache_key is not None and self.cursor.description:
+            entry = cache.put(self._result_cache_key,
+                              self._result_cache_tables,
+                              self.cursor.description,
+                              self.cursor.fetchall(),
+                              ttl=self.execution_options.get(
+                                        'sqlany_cache_ttl'))
+            self.cursor.close()
+            self.cursor = CachedCursor(entry)
+
+    def _invalidate_result_cache(self, cache):
+        """Discard cached results of the tables the statement may have
+        written.  Called from the dialect's ``do_execute()`` methods, as
+        post_exec() isn't called for plain string statements."""
+
+        if self._result_cache_key is not None:
+            return
         if self.isddl:
-            self.set_ddl_autocommit(self.root_connection, False)
+            tables = None
+        elif self.compiled is not None and \
+                isinstance(self.compiled.statement,
+                           (expression.UpdateBase, Merge)):
+            tables = [self._table_key(self.compiled.statement.table)]
+        elif self.compiled is not None and \
+                isinstance(self.compiled.statement, expression.SelectBase):
+            return
+        elif _READ_STATEMENT_RE.match(self.unicode_statement):
+            return
+        else:
+            # textual DML, tables unknown
+            tables = None
+
+        cache.invalidate(tables)
+        _dirty_tables(self.root_connection.connection).update(
+                                            tables or ['*'])
+
+    def fire_sequence(self, seq, type_):
+        return self._execute_scalar(
+            "SELECT %s.nextval FROM dummy" %
+            self.dialect.identifier_preparer.format_sequence(seq), type_)
 
     def get_lastrowid(self):
+        table = self.compiled.statement.table
+        # an INSERT's parameters are named after the columns' keys
+        params = self.compiled_parameters[0]
+        if all(params.get(c.key) is not None for c in table.primary_key):
+            # given explicitly or generated before the INSERT, no need to
+            # ask the server
+            return None
+
+        autoinc_col = table._autoincrement_column
+        if autoinc_col is not None:
+            seq = _column_sequence(autoinc_col)
+            if seq is not None:
+                # the INSERT used seq.nextval inline
+                return self._execute_scalar(
+                    "SELECT %s.currval FROM dummy" %
+                    self.dialect.identifier_preparer.format_sequence(seq),
+                    None)
+
         cursor = self.create_cursor()
         cursor.execute("SELECT @@identity AS lastrowid")
         lastrowid = cursor.fetchone()[0]
@@ -310,6 +747,80 @@ class SQLAnySQLCompiler(compiler.SQLCompiler):
         'milliseconds': 'millisecond'
     })
 
+    def visit_select(self, select, **kwargs):
+        if (select._limit_clause is not None or
+                select._offset_clause is not None) and \
+                ('compound_index' in kwargs or
+                 not self._simple_int_clauses(select)):
+            # TOP and START AT only take integer constants here, and
+            # aren't allowed in the branches of a UNION
+            kwargs['select_wraps_for'] = select
+            return self._paginate_row_number(select, **kwargs)
+        return compiler.SQLCompiler.visit_select(self, select, **kwargs)
+
+    @staticmethod
+    def _simple_int_clauses(select):
+        return (select._limit_clause is None or select._simple_int_limit) \
+            and (select._offset_clause is None or select._simple_int_offset)
+
+    def visit_compound_select(self, cs, **kwargs):
+        if cs._limit_clause is not None or cs._offset_clause is not None:
+            # the LIMIT of a UNION has nowhere to go but an enclosing
+            # SELECT
+            return self._paginate_row_number(cs, **kwargs)
+        return compiler.SQLCompiler.visit_compound_select(self, cs, **kwargs)
+
+    def _paginate_row_number(self, select, **kwargs):
+        """Compile `select` as a SELECT of its rows numbered with
+        ROW_NUMBER() in its ORDER BY, keeping those within its LIMIT and
+        OFFSET."""
+
+        if not select._order_by_clause.clauses:
+            # ROW_NUMBER() OVER () would number the rows arbitrarily
+            raise exc.CompileError(
+                "SQL Anywhere requires an order_by for a LIMIT or OFFSET "
+                "that isn't an integer constant, or that is in or of a "
+                "UNION")
+        order_by = [sql_util.unwrap_label_reference(elem)
+                    for elem in select._order_by_clause.clauses]
+        limit_clause = select._limit_clause
+        offset_clause = select._offset_clause
+        inner = select.limit(None).offset(None).order_by(None)
+
+        if isinstance(select, expression.Select):
+            row_number = sql.func.ROW_NUMBER().over(
+                order_by=order_by).label('sqlany_rn')
+            numbered = inner.column(row_number).alias()
+        else:
+            # a UNION can't take the extra column, so it is numbered from
+            # an enclosing SELECT
+            inner = inner.alias()
+            adapter = sql_util.ClauseAdapter(inner, adapt_on_names=True)
+            order_by = [inner.c[elem.element]
+                        if isinstance(elem, elements._textual_label_reference)
+                        else adapter.traverse(
+                            sql_util.unwrap_label_reference(elem))
+                        for elem in select._order_by_clause.clauses]
+            row_number = sql.func.ROW_NUMBER().over(
+                order_by=order_by).label('sqlany_rn')
+            numbered = sql.select([inner, row_number]).alias()
+
+        row_number = numbered.c.sqlany_rn
+        limited = sql.select([c for c in numbered.c if c.key != 'sqlany_rn'])
+        if offset_clause is not None:
+            limited.append_whereclause(row_number > offset_clause)
+            if limit_clause is not None:
+                # not "<= limit + offset", which would need the values
+                # rendered inline (ansi_bind_rules)
+                limited.append_whereclause(
+                    row_number - offset_clause <= limit_clause)
+        else:
+            limited.append_whereclause(row_number <= limit_clause)
+        if not self.stack:
+            # keep the order; ORDER BY is only allowed at the top
+            limited = limited.order_by(row_number)
+        return self.process(limited, **kwargs)
+
     def get_select_precolumns(self, select, **kw ):
         s = "DISTINCT " if select._distinct else ""
         if select._limit:
@@ -340,9 +851,238 @@ class SQLAnySQLCompiler(compiler.SQLCompiler):
         return 'DATEPART("%s", %s)' % (
                             field, self.process(extract.expr, **kw))
 
+    def visit_contains(self, element, **kw):
+        return "CONTAINS(%s, %s)" % (
+            ", ".join(self.process(c, **kw) for c in element.columns),
+            self.process(element.query, **kw))
+
+    def visit_sequence(self, seq, **kw):
+        return self.preparer.format_sequence(seq) + ".nextval"
+
     def visit_now_func(self, fn, **kw):
         return "NOW()"
 
+    def visit_in_op_binary(self, binary, operator_, **kw):
+        return self._render_in(binary, operator_, "IN", **kw)
+
+    def visit_notin_op_binary(self, binary, operator_, **kw):
+        return self._render_in(binary, operator_, "NOT IN", **kw)
+
+    def _render_in(self, binary, operator_, keyword, **kw):
+        """Render IN lists longer than the dialect's ``in_list_threshold``
+        as a semi-join against ``sa_split_list()`` of a single delimited
+        string parameter, so the statement text doesn't grow (or change)
+        with the number of values.
+
+        Only lists of literal values are rewritten.  Expanding parameters
+        (``in_(bindparam('x', expanding=True))``, as used by the ORM's
+        selectin loading) are expanded into a plain IN list at execution
+        time, after compilation.
+
+        """
+
+        split = self._split_in_list(binary, **kw)
+        if split is None:
+            return self._generate_generic_binary(
+                        binary, compiler.OPERATORS[operator_], **kw)
+
+        values, delimiter = split
+        list_bind = elements.BindParameter(
+                        None, delimiter.join(values),
+                        type_=sqltypes.String(), unique=True)
+        delimiter_bind = elements.BindParameter(
+                        None, delimiter, type_=sqltypes.String(), unique=True)
+
+        row_value = "row_value"
+        if binary.left.type._type_affinity is not sqltypes.String:
+            row_value = "CAST(row_value AS %s)" % \
+                            self.dialect.type_compiler.process(
+                                binary.left.type)
+
+        return "%s %s (SELECT %s FROM sa_split_list(%s, %s))" % (
+                    self.process(binary.left, **kw), keyword, row_value,
+                    self.process(list_bind, **kw),
+                    self.process(delimiter_bind, **kw))
+
+    def _split_in_list(self, binary, **kw):
+        threshold = self.dialect.in_list_threshold
+        if not threshold or kw.get('literal_binds'):
+            return None
+
+        right = binary.right
+        if not isinstance(right, elements.Grouping) or \
+                not isinstance(right.element, elements.ClauseList) or \
+                len(right.element.clauses) < threshold:
+            return None
+
+        type_ = binary.left.type
+        affinity = type_._type_affinity
+        if affinity not in (sqltypes.Integer, sqltypes.Numeric,
+                            sqltypes.String) or \
+                isinstance(type_, sqltypes.Enum):
+            return None
+        if affinity is sqltypes.Numeric:
+            impl = type_
+            if isinstance(impl, sqltypes.TypeDecorator):
+                impl = impl.type_engine(self.dialect)
+            if impl.precision is None or impl.scale is None:
+                # CAST(... AS NUMERIC) would use the server's default
+                # scale and so round the values
+                return None
+
+        values = []
+        for bind in right.element.clauses:
+            if not isinstance(bind, elements.BindParameter) or \
+                    bind.callable is not None or bind.value is None:
+                return None
+            processor = bind.type._cached_bind_processor(self.dialect)
+            value = bind.value
+            if processor is not None:
+                value = processor(value)
+            if isinstance(value, util.binary_type):
+                value = value.decode(self.dialect.encoding)
+            elif value is None:
+                return None
+            values.append(util.text_type(value))
+
+        if affinity is not sqltypes.String:
+            return values, ","
+        for delimiter in _SPLIT_LIST_DELIMITERS:
+            if not any(delimiter in value for value in values):
+                return values, delimiter
+        return None
+
+    def visit_insert(self, insert_stmt, asfrom=False, **kw):
+        if getattr(insert_stmt, '_on_existing', None) is None:
+            return super(SQLAnySQLCompiler, self).visit_insert(
+                insert_stmt, asfrom=asfrom, **kw)
+
+        # as SQLCompiler.visit_insert(), with ON EXISTING between the
+        # column list and VALUES / SELECT
+        if self.returning or insert_stmt._returning:
+            raise exc.CompileError(
+                "RETURNING is not supported with INSERT ... ON EXISTING")
+        toplevel = not self.stack
+        self.stack.append({"correlate_froms": set(),
+                           "asfrom_froms": set(),
+                           "selectable": insert_stmt})
+
+        crud_params = crud._setup_crud_params(
+            self, insert_stmt, crud.ISINSERT, **kw)
+        if not crud_params:
+            raise exc.CompileError(
+                "INSERT ... ON EXISTING requires at least one column value")
+        if insert_stmt._has_multi_parameters:
+            if not self.dialect.supports_multivalues_insert:
+                raise exc.CompileError(
+                    "The '%s' dialect with current database "
+                    "version settings does not support "
+                    "in-place multirow inserts." % self.dialect.name)
+            crud_params_single = crud_params[0]
+        else:
+            crud_params_single = crud_params
+
+        text = "INSERT "
+        if insert_stmt._prefixes:
+            text += self._generate_prefixes(
+                insert_stmt, insert_stmt._prefixes, **kw)
+        table_text = self.preparer.format_table(insert_stmt.table)
+        if insert_stmt._hints:
+            _, table_text = self._setup_crud_hints(insert_stmt, table_text)
+        text += "INTO %s (%s)" % (
+            table_text, ", ".join(self.preparer.format_column(c[0])
+                                  for c in crud_params_single))
+
+        text += " ON EXISTING " + insert_stmt._on_existing.upper()
+        if insert_stmt._on_existing_defaults is not None:
+            text += " DEFAULTS " + \
+                ("ON" if insert_stmt._on_existing_defaults else "OFF")
+
+        if insert_stmt.select is not None:
+            select_text = self.process(self._insert_from_select, **kw)
+            if self.ctes and toplevel and self.dialect.cte_follows_insert:
+                text += " %s%s" % (self._render_cte_clause(), select_text)
+            else:
+                text += " " + select_text
+        elif insert_stmt._has_multi_parameters:
+            text += " VALUES %s" % ", ".join(
+                "(%s)" % ", ".join(c[1] for c in crud_param_set)
+                for crud_param_set in crud_params)
+        else:
+            insert_single_values_expr = ", ".join(c[1] for c in crud_params)
+            text += " VALUES (%s)" % insert_single_values_expr
+            if toplevel:
+                self.insert_single_values_expr = insert_single_values_expr
+
+        if insert_stmt._post_values_clause is not None:
+            post_values_clause = self.process(
+                insert_stmt._post_values_clause, **kw)
+            if post_values_clause:
+                text += " " + post_values_clause
+
+        if self.ctes and toplevel and not self.dialect.cte_follows_insert:
+            text = self._render_cte_clause() + text
+
+        self.stack.pop(-1)
+
+        if asfrom:
+            return "(" + text + ")"
+        else:
+            return text
+
+    def _merge_values(self, merge, values):
+        for key, value in values:
+            col = merge.table.c[elements._column_as_key(key)]
+            if elements._is_literal(value):
+                value = elements.BindParameter(None, value, type_=col.type)
+            yield col, value
+
+    def visit_merge(self, merge, **kw):
+        if merge._source is None or merge._on is None:
+            raise exc.CompileError(
+                "MERGE requires both using() and on() to be specified")
+        if not merge._clauses:
+            raise exc.CompileError(
+                "MERGE requires at least one WHEN MATCHED / "
+                "WHEN NOT MATCHED clause")
+
+        self.stack.append({"correlate_froms": set(),
+                           "asfrom_froms": set(),
+                           "selectable": merge})
+
+        text = "MERGE INTO %s USING %s ON %s" % (
+            self.process(merge.table, asfrom=True, **kw),
+            self.process(merge._source, asfrom=True, **kw),
+            self.process(merge._on, **kw))
+
+        for clause in merge._clauses:
+            if clause.matched:
+                text += " WHEN MATCHED"
+            else:
+                text += " WHEN NOT MATCHED"
+            if clause.whereclause is not None:
+                text += " AND " + self.process(clause.whereclause, **kw)
+            text += " THEN "
+
+            if clause.action == 'update':
+                text += "UPDATE SET " + ", ".join(
+                    "%s = %s" % (self.preparer.format_column(col),
+                                 self.process(value.self_group(), **kw))
+                    for col, value in self._merge_values(merge,
+                                                         clause.values))
+            elif clause.action == 'insert':
+                values = list(self._merge_values(merge, clause.values))
+                text += "INSERT (%s) VALUES (%s)" % (
+                    ", ".join(self.preparer.format_column(col)
+                              for col, value in values),
+                    ", ".join(self.process(value, **kw)
+                              for col, value in values))
+            else:
+                text += clause.action.upper()
+
+        self.stack.pop(-1)
+        return text
+
     def for_update_clause(self, select):
         # "FOR UPDATE" is only allowed on "DECLARE CURSOR"
         # which SQLAlchemy doesn't use
@@ -363,26 +1103,25 @@ class SQLAnyDDLCompiler(compiler.DDLCompiler):
         colspec = self.preparer.format_column(column) + " " + \
                         self.dialect.type_compiler.process(column.type)
 
+        options = column.dialect_options['sqlany']
+        if options['compressed']:
+            colspec += " COMPRESSED"
+        if options['inline'] is not None:
+            colspec += " INLINE %d" % options['inline']
+        if options['prefix'] is not None:
+            colspec += " PREFIX %d" % options['prefix']
+
         if column.table is None:
             raise exc.CompileError(
                         "The SQLAny dialect requires Table-bound "
                        "columns in order to generate DDL")
         seq_col = column.table._autoincrement_column
 
-        # install a IDENTITY Sequence if we have an implicit IDENTITY column
-        if seq_col is column:
-            sequence = isinstance(column.default, sa_schema.Sequence) \
-                                    and column.default
-            if sequence:
-                start, increment = sequence.start or 1, \
-                                    sequence.increment or 1
-            else:
-                start, increment = 1, 1
-            if (start, increment) == (1, 1):
-                colspec += " IDENTITY"
-            else:
-                # TODO: need correct syntax for this
-                colspec += " IDENTITY(%s,%s)" % (start, increment)
+        # the implicit autoincrement column is an IDENTITY column unless a
+        # (non-optional) Sequence provides its values.  IDENTITY takes no
+        # start or increment; use a Sequence for those.
+        if seq_col is column and _column_sequence(column) is None:
+            colspec += " IDENTITY"
         else:
             default = self.get_column_default_string(column)
             if default is not None:
@@ -396,17 +1135,347 @@ class SQLAnyDDLCompiler(compiler.DDLCompiler):
 
         return colspec
 
+    def create_table_constraints(self, table, **kw):
+        text = super(SQLAnyDDLCompiler, self).create_table_constraints(
+            table, **kw)
+        # PCTFREE is a table element, so it goes inside the parentheses
+        pctfree = table.dialect_options['sqlany']['pctfree']
+        if pctfree is not None:
+            if text:
+                text += ", \n\t"
+            text += "PCTFREE %d" % pctfree
+        return text
+
+    def post_create_table(self, table):
+        dbspace = table.dialect_options['sqlany']['dbspace']
+        if dbspace is not None:
+            return " IN %s" % self.preparer.quote(dbspace)
+        return ""
+
+    def visit_primary_key_constraint(self, constraint):
+        if len(constraint) == 0:
+            return ""
+        # as DDLCompiler.visit_primary_key_constraint(), with CLUSTERED
+        text = ""
+        if constraint.name is not None:
+            formatted_name = self.preparer.format_constraint(constraint)
+            if formatted_name is not None:
+                text += "CONSTRAINT %s " % formatted_name
+        text += "PRIMARY KEY "
+        if constraint.dialect_options['sqlany']['clustered']:
+            text += "CLUSTERED "
+        text += "(%s)" % ", ".join(
+            self.preparer.quote(c.name)
+            for c in (constraint.columns_autoinc_first
+                      if constraint._implicit_generated
+                      else constraint.columns))
+        text += self.define_constraint_deferrability(constraint)
+        return text
+
+    def visit_create_index(self, create):
+        index = create.element
+        self._verify_index_table(index)
+        if index.name is None:
+            raise exc.CompileError(
+                "CREATE INDEX requires that the index have a name")
+        options = index.dialect_options['sqlany']
+        if options['text']:
+            return self._create_text_index(index, options)
+
+        text = "CREATE "
+        if options['virtual']:
+            text += "VIRTUAL "
+        if index.unique:
+            text += "UNIQUE "
+        if options['clustered']:
+            text += "CLUSTERED "
+        text += "INDEX %s ON %s (%s)" % (
+            self._prepared_index_name(index, include_schema=False),
+            self.preparer.format_table(index.table),
+            ", ".join(self.sql_compiler.process(expr, include_table=False,
+                                                literal_binds=True)
+                      for expr in index.expressions))
+        if options['dbspace'] is not None:
+            text += " IN %s" % self.preparer.quote(options['dbspace'])
+        return text
+
+    def _create_text_index(self, index, options):
+        text = "CREATE TEXT INDEX %s ON %s (%s)" % (
+            self._prepared_index_name(index, include_schema=False),
+            self.preparer.format_table(index.table),
+            ", ".join(self.preparer.quote(c.name) for c in index.columns))
+        # IN, CONFIGURATION and the refresh clause, in the order of the
+        # CREATE TEXT INDEX grammar
+        if options['dbspace'] is not None:
+            text += " IN %s" % self.preparer.quote(options['dbspace'])
+        if options['text_configuration'] is not None:
+            text += " CONFIGURATION %s" % \
+                self.preparer.quote(options['text_configuration'])
+        if options['text_refresh'] is not None:
+            # 'immediate', 'manual', 'auto' or e.g. 'auto every 2 hours'
+            words = _normalize_text_refresh(
+                options['text_refresh']).upper().split()
+            text += " " + " ".join(words[:1] + ["REFRESH"] + words[1:])
+        return text
+
     def visit_drop_index(self, drop):
         index = drop.element
+        if index.dialect_options['sqlany']['text']:
+            return "\nDROP TEXT INDEX %s ON %s" % (
+                self._prepared_index_name(index, include_schema=False),
+                self.preparer.format_table(index.table))
         return "\nDROP INDEX %s.%s" % (
             self.preparer.quote_identifier(index.table.name),
             self._prepared_index_name(drop.element,
                                         include_schema=False)
             )
 
+    def _format_view(self, element):
+        name = self.preparer.quote(element.name)
+        if element.schema is not None:
+            name = self.preparer.quote_schema(element.schema) + "." + name
+        return name
+
+    def visit_create_materialized_view(self, create):
+        text = "CREATE MATERIALIZED VIEW %s" % self._format_view(create)
+        if create.dbspace is not None:
+            text += " IN %s" % self.preparer.quote(create.dbspace)
+        return text + " AS %s" % self.sql_compiler.process(
+            create.selectable, literal_binds=True)
+
+    def visit_drop_materialized_view(self, drop):
+        return "DROP MATERIALIZED VIEW %s" % self._format_view(drop)
+
+    def visit_refresh_materialized_view(self, refresh):
+        text = "REFRESH MATERIALIZED VIEW %s" % self._format_view(refresh)
+        if refresh.isolation_level is not None:
+            text += " WITH ISOLATION LEVEL %s" % refresh.isolation_level
+        if refresh.force_build:
+            text += " FORCE BUILD"
+        return text
+
+    def visit_alter_materialized_view(self, alter):
+        return "ALTER MATERIALIZED VIEW %s %s REFRESH" % (
+            self._format_view(alter), alter.refresh.upper())
+
 class SQLAnyIdentifierPreparer(compiler.IdentifierPreparer):
     reserved_words = RESERVED_WORDS
 
+# The catalog queries issued by the dialect.  They are built once, and
+# SQLAnyDialect._execute_catalog() compiles each of them once per dialect.
+
+VERSION_SQL = text('select @@version')
+
+CURRENT_USER_SQL = text("SELECT current user").columns(
+    column('user_name', Unicode))
+
+# pct_free is NULL unless PCTFREE was given explicitly
+TABLEID_SQL = text("""
+    SELECT t.table_id AS id, t.pct_free AS pctfree,
+           f.dbspace_name AS dbspace
+    FROM sys.systab t JOIN dbo.sysusers u ON t.creator=u.uid
+         LEFT OUTER JOIN sys.sysfile f ON t.file_id = f.file_id
+    WHERE u.name = :schema_name
+        AND t.table_name = :table_name
+        AND t.table_type in (1, 2, 3, 4, 21)
+""")
+
+COLUMN_SQL = text("""
+    SELECT col.column_name AS name,
+           t.domain_name AS type,
+           if col.nulls ='Y' then 1 else 0 endif AS nullable,
+           if col."default" = 'autoincrement' then 1 else 0 endif AS autoincrement,
+           col."default" AS "default",
+           col.width AS "precision",
+           col.scale AS scale,
+           col.width AS length,
+           if col.compression_level > 0 then 1 else 0 endif AS compressed,
+           col.inline_max AS inline,
+           col.inline_long AS prefix
+    FROM sys.sysdomain t join sys.systabcol col on t.domain_id=col.domain_id
+    WHERE col.table_id = :table_id
+    ORDER BY col.column_id
+""")
+
+FK_COLUMN_SQL = text("""
+    SELECT c.column_id AS id, c.column_name AS name
+    FROM sys.systabcol c
+    WHERE c.table_id = :table_id
+""")
+
+REFCONSTRAINT_SQL = text("""
+    SELECT fk.foreign_index_id, i.index_name AS name, pt.table_id AS reftable_id
+    FROM sys.sysfkey fk
+    join sys.systab pt on fk.primary_table_id = pt.table_id
+    join sys.sysidx i on i.table_id=fk.primary_table_id
+    WHERE fk.foreign_table_id = :table_id
+    and i.index_category=2
+""")
+
+REFTABLE_SQL = text("""
+    SELECT t.table_name AS name, u.name AS "schema"
+    FROM sys.systab t JOIN dbo.sysusers u ON t.creator = u.uid
+    WHERE t.table_id = :table_id
+""")
+
+REFCOLS_SQL = text("""SELECT
+    ic.column_id as fokey,
+    pic.column_id as refkey
+    FROM sys.sysfkey fk
+    join sys.sysidxcol ic on (fk.foreign_index_id=ic.index_id and fk.foreign_table_id=ic.table_id)
+    join sys.sysidxcol pic on (fk.primary_index_id=pic.index_id and fk.primary_table_id=pic.table_id)
+    WHERE fk.primary_table_id = :reftable_id
+    and fk.foreign_table_id = :table_id
+    and fk.foreign_index_id = :foreign_index_id
+""")
+
+# index_category=3 -> not primary key, not foreign key, not text index
+# index_category=4 -> text index
+# unique=1 -> unique index, 2 -> unique constraint, 5->unique index with
+# nulls not distinct
+# refresh_type=1 -> manual, 2 -> auto, 3 -> immediate
+INDEX_SQL = text("""
+    SELECT i.index_id as index_id, i.index_name AS name,
+           if i."unique" in (1,2,5) then 1 else 0 endif AS "unique",
+           i.clustered AS clustered, f.dbspace_name AS dbspace,
+           if i.index_category = 4 then 1 else 0 endif AS is_text,
+           tcfg.text_config_name AS text_configuration,
+           ti.refresh_type AS refresh_type,
+           ti.refresh_interval AS refresh_interval
+    FROM sys.sysidx i join sys.systab t on i.table_id=t.table_id
+    LEFT OUTER JOIN sys.sysfile f on i.file_id=f.file_id
+    LEFT OUTER JOIN sys.systextidx ti on ti.index_id=i.object_id
+    LEFT OUTER JOIN sys.systextconfig tcfg
+         on tcfg.object_id=ti.text_config_id
+    WHERE t.table_id = :table_id and i.index_category in (3, 4)
+""")
+
+# order: 'A' -> ascending, 'D' -> descending
+INDEXCOL_SQL = text("""
+    select tc.column_name as col, ic."order" AS "order"
+    FROM sys.sysidxcol ic
+    join sys.systabcol tc on (ic.table_id=tc.table_id and ic.column_id=tc.column_id)
+    WHERE ic.index_id = :index_id and ic.table_id = :table_id
+    ORDER BY ic.sequence ASC
+""")
+
+# index_category=1 -> primary key
+PK_SQL = text("""
+    SELECT t.table_name AS table_name, i.index_id as index_id,
+           i.index_name AS name, i.clustered AS clustered
+    FROM sys.sysidx i join sys.systab t on i.table_id=t.table_id
+    WHERE t.table_id = :table_id and i.index_category = 1
+""")
+
+PKCOL_SQL = text("""
+    select tc.column_name as col
+    FROM sys.sysidxcol ic
+    join sys.systabcol tc on (ic.table_id=tc.table_id and ic.column_id=tc.column_id)
+    WHERE ic.index_id = :index_id and ic.table_id = :table_id
+""")
+
+# unique=2 -> unique constraint
+UNIQUE_SQL = text("""
+    SELECT i.index_id as index_id, i.index_name AS name
+    FROM sys.sysidx i join sys.systab t on i.table_id=t.table_id
+    WHERE t.table_id = :table_id and i.index_category = 3 and i."unique"=2
+""")
+
+UNIQUECOL_SQL = text("""
+    select tc.column_name as col
+    FROM sys.sysidxcol ic
+    join sys.systabcol tc on (ic.table_id=tc.table_id and ic.column_id=tc.column_id)
+    WHERE ic.index_id = :index_id and ic.table_id = :table_id
+    ORDER BY ic.sequence ASC
+""")
+
+SCHEMA_SQL = text("SELECT u.name AS name FROM dbo.sysusers u")
+
+TABLE_SQL = text("""
+    SELECT t.table_name AS name
+    FROM sys.systab t JOIN dbo.sysusers u ON t.creator = u.uid
+    WHERE u.name = :schema_name and table_type not in (2, 21)
+""")
+
+VIEW_DEF_SQL = text("""
+    SELECT v.view_def as text
+    FROM sys.sysview v JOIN sys.sysobject o ON v.view_object_id = o.object_id
+    join sys.systab t on o.object_id=t.object_id
+    WHERE t.table_name = :view_name
+      AND t.table_type in (2, 21)
+""")
+
+# table_type=21 -> view, 2 -> materialized view; one statement per
+# combination that get_view_names() can ask for
+VIEW_SQL = dict((table_types, text("""
+    SELECT t.table_name AS name
+    FROM sys.systab t JOIN dbo.sysusers u ON t.creator = u.uid
+    WHERE u.name = :schema_name
+      AND t.table_type in (%s)
+""" % ", ".join(str(t) for t in table_types)))
+    for table_types in [(21,), (2,), (21, 2)])
+
+# mv_refresh_type: 'I' -> immediate, 'M' -> manual
+MATVIEW_SQL = text("""
+    SELECT v.mv_refresh_type AS refresh,
+           v.mv_last_refreshed_at AS last_refreshed
+    FROM sys.sysview v JOIN sys.systab t
+         ON v.view_object_id = t.object_id
+    JOIN dbo.sysusers u ON t.creator = u.uid
+    WHERE u.name = :schema_name AND t.table_name = :view_name
+      AND t.table_type = 2
+""")
+
+# "count" is the number of rows as of the last checkpoint
+TABLE_STATS_SQL = text("""
+    SELECT t.table_name AS name, t."count" AS row_count,
+           t.table_page_count AS table_pages,
+           t.ext_page_count AS ext_pages,
+           t.last_modified_at AS last_modified
+    FROM sys.systab t JOIN dbo.sysusers u ON t.creator = u.uid
+    WHERE u.name = :schema_name and t.table_type <> 21
+""")
+
+COLSTAT_SQL = text("""
+    SELECT t.table_name AS table_name, tc.column_name AS name,
+           s.density AS density, s.update_count AS update_count,
+           s.last_updated AS last_updated
+    FROM sys.syscolstat s
+    JOIN sys.systabcol tc ON (s.table_id = tc.table_id
+                              AND s.column_id = tc.column_id)
+    JOIN sys.systab t ON tc.table_id = t.table_id
+    JOIN dbo.sysusers u ON t.creator = u.uid
+    WHERE u.name = :schema_name and t.table_type <> 21
+""")
+
+HISTOGRAM_SQL = text("""
+    SELECT t.table_name AS table_name, tc.column_name AS name,
+           h.StepNumber AS step, h.Low_Value AS low_value,
+           h.High_Value AS high_value, h.Frequency AS frequency
+    FROM sys.syscolstat s
+    JOIN sys.systabcol tc ON (s.table_id = tc.table_id
+                              AND s.column_id = tc.column_id)
+    JOIN sys.systab t ON tc.table_id = t.table_id
+    JOIN dbo.sysusers u ON t.creator = u.uid
+    CROSS APPLY sa_get_histogram(tc.column_name, t.table_name,
+                                 u.name) h
+    WHERE u.name = :schema_name and t.table_type <> 21
+    ORDER BY t.table_name, tc.column_name, h.StepNumber
+""")
+
+SEQUENCE_SQL = text("""
+    SELECT s.sequence_name AS name
+    FROM sys.syssequence s JOIN dbo.sysusers u ON s.owner = u.uid
+    WHERE u.name = :schema_name AND s.sequence_name = :sequence_name
+""")
+
+SEQUENCES_SQL = text("""
+    SELECT s.sequence_name AS name
+    FROM sys.syssequence s JOIN dbo.sysusers u ON s.owner = u.uid
+    WHERE u.name = :schema_name
+""")
+
+
 class SQLAnyDialect(default.DefaultDialect):
     name = 'sqlany'
     supports_unicode_statements = False
@@ -418,29 +1487,80 @@ class SQLAnyDialect(default.DefaultDialect):
     postfetch_lastrowid = True
     supports_multivalues_insert = True
 
+    # CREATE SEQUENCE is available from version 12; sequences marked
+    # optional are left to IDENTITY columns
+    supports_sequences = True
+    sequences_optional = True
+
     # if not present, then sqlalchemy expects a float when dealing with 'Numeric' decimal types
     # but by default sqlanydb returns them as strings, which freaks sqlalchemy out
     # so we return them as Decimal objects, by use of a converter function and 
     # `sqlanydb.register_converter()`
     supports_native_decimal = True 
 
-
+    def __init__(self, isolation_level=None, result_cache_size=0,
+                 result_cache_ttl=60, in_list_threshold=None,
+                 retry_policy=None, connect_options=None,
+                 max_query_tasks=None, optimization_goal=None,
+                 executemany_batch_size=None, **kwargs):
+        super(SQLAnyDialect, self).__init__(**kwargs)
+        self.isolation_level = isolation_level
+        # reflected column types by (domain, width, scale), see
+        # _get_column_type()
+        self._column_types = util.LRUCache(200)
+        # compiled forms of the catalog queries, see _execute_catalog()
+        self._compiled_catalog = {}
+        # temporary options set on every new connection, see on_connect()
+        self.connect_options = util.OrderedDict(connect_options or ())
+        self._set_option_knobs(self.connect_options, max_query_tasks,
+                               optimization_goal)
+        # opt-in replay of statements failing with transient errors, see
+        # sqlalchemy_sqlany.retry.RetryPolicy
+        self.retry_policy = retry_policy
+        # IN lists of at least this many literal values are sent as a
+        # single sa_split_list() parameter, see SQLAnySQLCompiler
+        self.in_list_threshold = in_list_threshold
+        # INSERT, UPDATE and DELETE executemany() calls are sent this many
+        # statements to a round trip, see do_executemany()
+        self.executemany_batch_size = executemany_batch_size
+        if executemany_batch_size and self.positional:
+            # the row counts are fetched per statement, see do_execute()
+            self.supports_sane_rowcount = True
+            self.supports_sane_multi_rowcount = True
+        # opt-in cache of SELECT results, see SQLAnyExecutionContext
+        if result_cache_size:
+            self._result_cache = ResultCache(result_cache_size,
+                                             result_cache_ttl)
+        else:
+            self._result_cache = None
 
     @classmethod
     def dbapi(self):
         return sqlanydb
 
-    @property
-    def driver(self):
-        return sqlanydb
+    driver = 'sqlanydb'
 
-    def create_connect_args(self, url):
+    def create_connect_args(self, url_):
 
         # get extra options
-        dialect_opts = dict(url.query)
-
-        opts = url.translate_connect_args(username='uid', password='pwd',
-                                          database='dbn' )
+        dialect_opts = dict(url_.query)
+
+        # connection options given in the URL, e.g.
+        # ?max_query_tasks=4&option_blocking_timeout=5000; those given to
+        # create_engine() take precedence
+        url_options = util.OrderedDict()
+        for key in sorted(dialect_opts):
+            if key.startswith(_URL_OPTION_PREFIX):
+                url_options[key[len(_URL_OPTION_PREFIX):]] = \
+                    dialect_opts.pop(key)
+        self._set_option_knobs(url_options,
+                               *[dialect_opts.pop(key, None)
+                                 for key in _URL_OPTION_KNOBS])
+        for name, value in url_options.items():
+            self.connect_options.setdefault(name, value)
+
+        opts = url_.translate_connect_args(username='uid', password='pwd',
+                                           database='dbn' )
         keys = list(opts.keys())
         if 'host' in keys and 'port' in keys:
             opts['host'] += ':%s' % opts['port']
@@ -450,7 +1570,35 @@ class SQLAnyDialect(default.DefaultDialect):
         return ([], opts)
     #
 
-    colspecs = {}
+    construct_arguments = [
+        (sa_schema.Table, {
+            "pctfree": None,
+            "dbspace": None,
+        }),
+        (sa_schema.Column, {
+            "compressed": False,
+            "inline": None,
+            "prefix": None,
+        }),
+        (sa_schema.PrimaryKeyConstraint, {
+            "clustered": False,
+        }),
+        (sa_schema.Index, {
+            "clustered": False,
+            "dbspace": None,
+            "virtual": False,
+            "text": False,
+            "text_configuration": None,
+            "text_refresh": None,
+        }),
+    ]
+
+    colspecs = {
+        sqltypes.LargeBinary: _SQLAnyBinary,
+        sqltypes.Date: _SQLAnyDate,
+        sqltypes.Time: _SQLAnyTime,
+        sqltypes.DateTime: _SQLAnyDateTime,
+    }
     ischema_names = ischema_names
 
     type_compiler = SQLAnyTypeCompiler
@@ -460,17 +1608,213 @@ class SQLAnyDialect(default.DefaultDialect):
     inspector = SQLAnyInspector
     execution_ctx_cls = SQLAnyExecutionContext
 
+    def do_execute(self, cursor, statement, parameters, context=None):
+        """Execute `statement` with `parameters`.
+
+        With the ``executemany_batch_size`` dialect option, a single UPDATE
+        or DELETE is sent as a batch of one statement, which returns its
+        ``@@rowcount`` in the same round trip, so that the ORM can check
+        the version counters of the rows it updates one at a time.
+
+        """
+        if self._batches(context) and (context.isupdate or
+                                       context.isdelete):
+            execute = self._execute_batches
+            args = (cursor, statement, [parameters], context)
+        else:
+            execute = cursor.execute
+            args = (statement, parameters)
+        if self.retry_policy is None or context is None:
+            execute(*args)
+        else:
+            self.retry_policy._execute(context, execute, *args)
+        self._invalidate_result_cache(context)
+
+    def do_execute_no_params(self, cursor, statement, context=None):
+        if self.retry_policy is None or context is None:
+            cursor.execute(statement)
+        else:
+            self.retry_policy._execute(context, cursor.execute, statement)
+        self._invalidate_result_cache(context)
+
+    def do_executemany(self, cursor, statement, parameters, context=None):
+        """Execute `statement` once for each set of `parameters`.
+
+        With the ``executemany_batch_size`` dialect option, INSERT, UPDATE
+        and DELETE statements, such as those the ORM groups together in a
+        flush, are sent in ``BEGIN ... END`` batches of that many
+        statements, each batch taking one round trip instead of one per
+        statement.  The batch returns the number of rows each statement
+        affected; along with the single statements of do_execute(), this
+        turns on ``supports_sane_rowcount`` and
+        ``supports_sane_multi_rowcount`` (for positional paramstyles,
+        which batching requires) and the ORM checks version counters and
+        deleted rows as usual.
+
+        Only the statements of one executemany() call are batched
+        together, not those a flush sends for different tables: the unit
+        of work reads each statement's result, such as the generated
+        keys of an INSERT, before it sends the next one.
+
+        executemany() calls aren't replayed by a ``retry_policy``: after a
+        lock timeout some of the rows have been written, and replaying
+        them all would write those twice.
+
+        """
+        if self._batches(context) and (context.isinsert or
+                                       context.isupdate or
+                                       context.isdelete):
+            self._execute_batches(cursor, statement, parameters, context)
+        else:
+            cursor.executemany(statement, parameters)
+        self._invalidate_result_cache(context)
+
+    def _batches(self, context):
+        return bool(self.executemany_batch_size) and \
+            context is not None and self.positional
+
+    def _execute_batches(self, cursor, statement, parameters, context):
+        size = self.executemany_batch_size
+        rowcounts = []
+        for start in range(0, len(parameters), size):
+            chunk = parameters[start:start + size]
+            batch = _batch_statement(context.unicode_statement, len(chunk))
+            if isinstance(statement, bytes):
+                batch = batch.encode(self.encoding)
+            cursor.execute(batch, [value for params in chunk
+                                   for value in params])
+            rowcounts.extend(cursor.fetchone())
+        context._rowcounts = rowcounts
+
+    def do_commit(self, dbapi_connection):
+        dbapi_connection.commit()
+        self._invalidate_dirty_tables(dbapi_connection)
+
+    def do_rollback(self, dbapi_connection):
+        dbapi_connection.rollback()
+        self._invalidate_dirty_tables(dbapi_connection)
+
+    def _invalidate_result_cache(self, context):
+        if self._result_cache is not None and context is not None:
+            context._invalidate_result_cache(self._result_cache)
+
+    def _invalidate_dirty_tables(self, connection):
+        # cached reads made by other connections while this transaction
+        # was open may have seen either the old or the new rows
+        if self._result_cache is None or not hasattr(connection, 'info'):
+            return
+        dirty = _dirty_tables(connection)
+        if dirty:
+            self._result_cache.invalidate(None if '*' in dirty else dirty)
+            dirty.clear()
+
+    def _set_option_knobs(self, options, max_query_tasks,
+                          optimization_goal):
+        if max_query_tasks is not None:
+            # 1 turns intra-query parallelism off, 0 lets the server decide
+            options['max_query_tasks'] = int(max_query_tasks)
+        if optimization_goal is not None:
+            if optimization_goal.lower() not in _OPTIMIZATION_GOALS:
+                raise exc.ArgumentError(
+                    "optimization_goal must be one of %s; got %r" %
+                    (", ".join(sorted(_OPTIMIZATION_GOALS.values())),
+                     optimization_goal))
+            options['optimization_goal'] = \
+                _OPTIMIZATION_GOALS[optimization_goal.lower()]
+
+    def on_connect(self):
+        # fetch temporal values in the ISO formats the result processors
+        # parse, keeping microseconds; then the isolation level and the
+        # connect_options, all in one round trip
+        options = list(_TEMPORAL_OPTIONS)
+        if self.isolation_level is not None:
+            options.extend(self._isolation_options(self.isolation_level))
+        options.extend(self.connect_options.items())
+        statement = _set_options_statement(options)
+
+        def connect(conn):
+            cursor = conn.cursor()
+            try:
+                cursor.execute(statement)
+            finally:
+                cursor.close()
+        return connect
+
+    def set_isolation_level(self, connection, level):
+        """Set the isolation level of the DBAPI connection.
+
+        Besides the ANSI levels SQL Anywhere has ``SNAPSHOT``,
+        ``STATEMENT SNAPSHOT`` and ``READONLY STATEMENT SNAPSHOT``, which
+        let readers see committed data without blocking writers (the
+        database needs the ``allow_snapshot_isolation`` option).
+        ``AUTOCOMMIT`` turns the ``chained`` option off so that each
+        statement is committed as it completes.  Levels may be given
+        with ``_`` or ``-`` in place of the spaces.
+
+        """
+        statement = _set_options_statement(self._isolation_options(level))
+        cursor = connection.cursor()
+        try:
+            cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    def _isolation_options(self, level):
+        name = level.upper().replace('_', ' ').replace('-', ' ')
+        if name == 'AUTOCOMMIT':
+            return [('chained', 'Off')]
+        elif name in _ISOLATION_LEVELS:
+            return [('chained', 'On'),
+                    ('isolation_level', _ISOLATION_LEVELS[name])]
+        raise exc.ArgumentError(
+            "Invalid value '%s' for isolation_level. "
+            "Valid isolation levels for %s are %s" %
+            (level, self.name,
+             ", ".join(sorted(_ISOLATION_LEVELS) + ['AUTOCOMMIT'])))
+
+    def get_isolation_level(self, connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT CONNECTION_PROPERTY('isolation_level'), "
+                           "CONNECTION_PROPERTY('chained')")
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        if row is None:
+            raise exc.InvalidRequestError(
+                "Could not read the isolation_level and chained connection "
+                "options")
+        level, chained = [v.decode('ascii') if isinstance(v, bytes) else v
+                          for v in row]
+        if chained.lower() == 'off':
+            return 'AUTOCOMMIT'
+        return _ISOLATION_NAMES.get(level.lower(), level.upper())
+
+    def get_default_isolation_level(self, dbapi_conn):
+        try:
+            return self.get_isolation_level(dbapi_conn)
+        except exc.InvalidRequestError:
+            return None
+
+    def _execute_catalog(self, connection, statement, **params):
+        """Execute one of the dialect's catalog queries, compiling it only
+        the first time."""
+
+        try:
+            compiled = self._compiled_catalog[statement]
+        except KeyError:
+            compiled = self._compiled_catalog[statement] = \
+                statement.compile(dialect=self)
+        return connection.execute(compiled, **params)
+
     def _get_default_schema_name(self, connection):
-        return connection.scalar(
-                     text("SELECT current user").columns(column('user_name', Unicode))
-             )
+        return self._execute_catalog(connection, CURRENT_USER_SQL).scalar()
 
     def initialize(self, connection):
         super(SQLAnyDialect, self).initialize(connection)
         self.max_identifier_length = 128
 
-        VERSION_SQL = text('select @@version')
-        result = connection.execute(VERSION_SQL)
+        result = self._execute_catalog(connection, VERSION_SQL)
         vers = result.scalar()
         self.server_version_info = tuple( vers.split(' ')[0].split( '.' ) )
 
@@ -483,98 +1827,97 @@ class SQLAnyDialect(default.DefaultDialect):
 
         """
 
-        table_id = None
+        return self._get_table_row(connection, table_name, schema,
+                                   **kw)["id"]
+
+    @reflection.cache
+    def _get_table_row(self, connection, table_name, schema=None, **kw):
+        # the table's storage options come along with its id, see
+        # get_table_options()
         if schema is None:
             schema = self.default_schema_name
-        TABLEID_SQL = text("""
-          SELECT t.table_id AS id
-          FROM sys.systab t JOIN dbo.sysusers u ON t.creator=u.uid
-          WHERE u.name = :schema_name
-              AND t.table_name = :table_name
-              AND t.table_type in (1, 3, 4, 21)
-        """)
-
         # Py2K
         if isinstance(schema, str):
             schema = schema.encode("ascii")
         if isinstance(table_name, str):
             table_name = table_name.encode("ascii")
         # end Py2K
-        result = connection.execute(TABLEID_SQL,
-                                    schema_name=schema,
-                                    table_name=table_name)
-        table_id = result.scalar()
-        if table_id is None:
+        result = self._execute_catalog(connection, TABLEID_SQL,
+                                       schema_name=schema,
+                                       table_name=table_name)
+        row = result.fetchone()
+        result.close()
+        if row is None:
             raise exc.NoSuchTableError(table_name)
-        return table_id
+        return row
 
     @reflection.cache
     def get_columns(self, connection, table_name, schema=None, **kw):
         table_id = self.get_table_id(connection, table_name, schema,
                                      info_cache=kw.get("info_cache"))
 
-        COLUMN_SQL = text("""
-          SELECT col.column_name AS name,
-                 t.domain_name AS type,
-                 if col.nulls ='Y' then 1 else 0 endif AS nullable,
-                 if col."default" = 'autoincrement' then 1 else 0 endif AS autoincrement,
-                 col."default" AS "default",
-                 col.width AS "precision",
-                 col.scale AS scale,
-                 col.width AS length
-          FROM sys.sysdomain t join sys.systabcol col on t.domain_id=col.domain_id
-          WHERE col.table_id = :table_id
-          ORDER BY col.column_id
-        """)
-
-        results = connection.execute(COLUMN_SQL, table_id=table_id)
+        results = self._execute_catalog(connection, COLUMN_SQL,
+                                        table_id=table_id)
 
         columns = []
-        for (name, type_, nullable, autoincrement, default, precision, scale,
-             length) in results:
+        for (name, type_, nullable, autoincrement, column_default, precision,
+             scale, length, compressed, inline, prefix) in results:
             col_info = self._get_column_info(name, type_, bool(nullable),
-                             bool(autoincrement), default, precision, scale,
-                             length)
+                             bool(autoincrement), column_default, precision,
+                             scale, length)
+            col_info["dialect_options"] = {"sqlany_compressed": bool(compressed),
+                                           "sqlany_inline": inline,
+                                           "sqlany_prefix": prefix}
             columns.append(col_info)
 
         return columns
 
-    def _get_column_info(self, name, type_, nullable, autoincrement, default,
-            precision, scale, length):
-
-        coltype = self.ischema_names.get(type_, None)
-
-        kwargs = {}
-
-        if coltype in (NUMERIC, DECIMAL):
-            args = (precision, scale)
-        elif coltype == FLOAT:
-            args = (precision,)
-        elif coltype in (CHAR, VARCHAR, UNICHAR, UNIVARCHAR, NCHAR, NVARCHAR):
-            args = (length,)
-        else:
-            args = ()
+    def _get_column_info(self, name, type_, nullable, autoincrement,
+            column_default, precision, scale, length):
 
-        if coltype:
-            coltype = coltype(*args, **kwargs)
-            #is this necessary
-            #if is_array:
-            #     coltype = ARRAY(coltype)
-        else:
+        coltype = self._get_column_type(type_, precision, scale)
+        if coltype is None:
             util.warn("Did not recognize type '%s' of column '%s'" %
                       (type_, name))
             coltype = sqltypes.NULLTYPE
 
-        if default:
-            default = re.sub("DEFAULT", "", default).strip()
-            default = re.sub("^'(.*)'$", lambda m: m.group(1), default)
+        if column_default:
+            m = _COLUMN_DEFAULT_RE.match(column_default)
+            column_default = m.group(1) if m.group(1) is not None \
+                else m.group(2)
         else:
-            default = None
+            column_default = None
 
         column_info = dict(name=name, type=coltype, nullable=nullable,
-                           default=default, autoincrement=autoincrement)
+                           default=column_default,
+                           autoincrement=autoincrement)
         return column_info
 
+    def _get_column_type(self, type_, width, scale):
+        """Return a new type instance for a column of domain `type_`.
+
+        Reflected types may be modified afterwards, so every column gets an
+        instance of its own, copied from one kept per domain, width and
+        scale (copying is several times faster than the constructors).
+
+        """
+        key = (type_, width, scale)
+        proto = self._column_types.get(key)
+        if proto is None:
+            coltype = self.ischema_names.get(type_)
+            if coltype is None:
+                return None
+            if coltype in _PRECISION_SCALE_TYPES:
+                proto = coltype(width, scale)
+            elif coltype in _PRECISION_TYPES or coltype in _LENGTH_TYPES:
+                proto = coltype(width)
+            else:
+                proto = coltype()
+            self._column_types[key] = proto
+        coltype = proto.__class__.__new__(proto.__class__)
+        coltype.__dict__.update(proto.__dict__)
+        return coltype
+
     @reflection.cache
     def get_foreign_keys(self, connection, table_name, schema=None, **kw):
 
@@ -587,41 +1930,25 @@ class SQLAnyDialect(default.DefaultDialect):
 
         table_cache[table_id] = {"name": table_name, "schema": schema}
 
-        COLUMN_SQL = text("""
-          SELECT c.column_id AS id, c.column_name AS name
-          FROM sys.systabcol c
-          WHERE c.table_id = :table_id
-        """)
-
-        results = connection.execute(COLUMN_SQL, table_id=table_id)
+        results = self._execute_catalog(connection, FK_COLUMN_SQL,
+                                        table_id=table_id)
         columns = {}
         for col in results:
             columns[col["id"]] = col["name"]
         column_cache[table_id] = columns
 
-        REFCONSTRAINT_SQL = text("""
-          SELECT fk.foreign_index_id, i.index_name AS name, pt.table_id AS reftable_id
-          FROM sys.sysfkey fk
-          join sys.systab pt on fk.primary_table_id = pt.table_id
-          join sys.sysidx i on i.table_id=fk.primary_table_id
-          WHERE fk.foreign_table_id = :table_id
-          and i.index_category=2
-        """)
-        referential_constraints = connection.execute(REFCONSTRAINT_SQL,
-                                                     table_id=table_id)
-
-        REFTABLE_SQL = text("""
-          SELECT t.table_name AS name, u.name AS "schema"
-          FROM sys.systab t JOIN dbo.sysusers u ON t.creator = u.uid
-          WHERE t.table_id = :table_id
-        """)
+        # fetched before querying further: on an Engine each query checks
+        # out a connection until its rows are consumed
+        referential_constraints = self._execute_catalog(
+            connection, REFCONSTRAINT_SQL, table_id=table_id).fetchall()
 
         for r in referential_constraints:
             reftable_id = r["reftable_id"]
             foreign_index_id = r["foreign_index_id"]
 
             if reftable_id not in table_cache:
-                c = connection.execute(REFTABLE_SQL, table_id=reftable_id)
+                c = self._execute_catalog(connection, REFTABLE_SQL,
+                                          table_id=reftable_id)
                 reftable = c.fetchone()
                 c.close()
                 table_info = {"name": reftable["name"], "schema": None}
@@ -630,7 +1957,8 @@ class SQLAnyDialect(default.DefaultDialect):
                     table_info["schema"] = reftable["schema"]
 
                 table_cache[reftable_id] = table_info
-                results = connection.execute(COLUMN_SQL, table_id=reftable_id)
+                results = self._execute_catalog(connection, FK_COLUMN_SQL,
+                                                table_id=reftable_id)
                 reftable_columns = {}
                 for col in results:
                     reftable_columns[col["id"]] = col["name"]
@@ -641,20 +1969,10 @@ class SQLAnyDialect(default.DefaultDialect):
 
             constrained_columns = []
             referred_columns = []
-            REFCOLS_SQL = text("""SELECT 
-            ic.column_id as fokey,
-            pic.column_id as refkey
-            FROM sys.sysfkey fk
-            join sys.sysidxcol ic on (fk.foreign_index_id=ic.index_id and fk.foreign_table_id=ic.table_id)
-            join sys.sysidxcol pic on (fk.primary_index_id=pic.index_id and fk.primary_table_id=pic.table_id)
-            WHERE fk.primary_table_id = :reftable_id
-            and fk.foreign_table_id = :table_id
-            and fk.foreign_index_id = :foreign_index_id
-            """)
-            ref_cols = connection.execute(REFCOLS_SQL,
-                                          table_id=table_id,
-                                          reftable_id=reftable_id,
-                                          foreign_index_id=foreign_index_id)
+            ref_cols = self._execute_catalog(connection, REFCOLS_SQL,
+                                             table_id=table_id,
+                                             reftable_id=reftable_id,
+                                             foreign_index_id=foreign_index_id)
             for rc in ref_cols:
                 constrained_columns.append(columns[rc["fokey"]])
                 referred_columns.append(reftable_columns[rc["refkey"]])
@@ -676,32 +1994,36 @@ class SQLAnyDialect(default.DefaultDialect):
         table_id = self.get_table_id(connection, table_name, schema,
                                      info_cache=kw.get("info_cache"))
 
-        # index_category=3 -> not primary key, not foreign key, not text index
-        # unique=1 -> unique index, 2 -> unique constraint, 5->unique index with
-        # nulls not distinct
-        INDEX_SQL = text("""
-          SELECT i.index_id as index_id, i.index_name AS name,
-                 if i."unique" in (1,2,5) then 1 else 0 endif AS "unique"
-          FROM sys.sysidx i join sys.systab t on i.table_id=t.table_id
-          WHERE t.table_id = :table_id and i.index_category = 3
-        """)
-
-        results = connection.execute(INDEX_SQL, table_id=table_id)
+        # fetched before the column queries, see get_foreign_keys()
+        results = self._execute_catalog(connection, INDEX_SQL,
+                                        table_id=table_id).fetchall()
         indexes = []
         for r in results:
-            INDEXCOL_SQL = text("""
-             select tc.column_name as col
-             FROM sys.sysidxcol ic
-             join sys.systabcol tc on (ic.table_id=tc.table_id and ic.column_id=tc.column_id)
-             WHERE ic.index_id = :index_id and ic.table_id = :table_id
-             ORDER BY ic.sequence ASC
-            """)
-            idx_cols = connection.execute(INDEXCOL_SQL, index_id=r["index_id"],
-                                          table_id=table_id)
+            idx_cols = self._execute_catalog(connection, INDEXCOL_SQL,
+                                             index_id=r["index_id"],
+                                             table_id=table_id).fetchall()
             column_names = [ic["col"] for ic in idx_cols]
+            dbspace = r["dbspace"]
+            if dbspace is not None and dbspace.lower() == 'system':
+                # the default, omitted so that reflected indexes compare
+                # equal to ones declared without a dbspace
+                dbspace = None
             index_info = {"name": r["name"],
                           "unique": bool(r["unique"]),
-                          "column_names": column_names}
+                          "column_names": column_names,
+                          "dialect_options": {
+                              "sqlany_clustered": bool(r["clustered"]),
+                              "sqlany_dbspace": dbspace,
+                              "sqlany_text": bool(r["is_text"])}}
+            if r["is_text"]:
+                index_info["dialect_options"].update(
+                    sqlany_text_configuration=r["text_configuration"],
+                    sqlany_text_refresh=_text_index_refresh(
+                        r["refresh_type"], r["refresh_interval"]))
+            column_sorting = dict((ic["col"], ("desc",)) for ic in idx_cols
+                                  if ic["order"] == 'D')
+            if column_sorting:
+                index_info["column_sorting"] = column_sorting
             indexes.append(index_info)
 
         return indexes
@@ -711,15 +2033,8 @@ class SQLAnyDialect(default.DefaultDialect):
         table_id = self.get_table_id(connection, table_name, schema,
                                      info_cache=kw.get("info_cache"))
 
-        # index_category=1 -> primary key
-        PK_SQL = text("""
-          SELECT t.table_name AS table_name, i.index_id as index_id,
-                 i.index_name AS name
-          FROM sys.sysidx i join sys.systab t on i.table_id=t.table_id
-          WHERE t.table_id = :table_id and i.index_category = 1
-        """)
-
-        results = connection.execute(PK_SQL, table_id=table_id)
+        results = self._execute_catalog(connection, PK_SQL,
+                                        table_id=table_id)
         pks = results.fetchone()
         results.close()
 
@@ -727,17 +2042,13 @@ class SQLAnyDialect(default.DefaultDialect):
             return {"constrained_columns": [],
                     "name": None}
 
-        PKCOL_SQL = text("""
-             select tc.column_name as col
-             FROM sys.sysidxcol ic
-             join sys.systabcol tc on (ic.table_id=tc.table_id and ic.column_id=tc.column_id)
-             WHERE ic.index_id = :index_id and ic.table_id = :table_id
-            """)
-        pk_cols = connection.execute(PKCOL_SQL, index_id=pks["index_id"],
-                                     table_id=table_id )
+        pk_cols = self._execute_catalog(connection, PKCOL_SQL,
+                                        index_id=pks["index_id"],
+                                        table_id=table_id)
         column_names = [pkc["col"] for pkc in pk_cols]
         return {"constrained_columns": column_names,
-                "name": pks["name"]}
+                "name": pks["name"],
+                "dialect_options": {"sqlany_clustered": bool(pks["clustered"])}}
 
     @reflection.cache
     def get_unique_constraints(self, connection, table_name, schema=None, **kw):
@@ -745,25 +2056,14 @@ class SQLAnyDialect(default.DefaultDialect):
         table_id = self.get_table_id(connection, table_name, schema,
                                      info_cache=kw.get("info_cache"))
 
-        # unique=2 -> unique constraint
-        INDEX_SQL = text("""
-          SELECT i.index_id as index_id, i.index_name AS name
-          FROM sys.sysidx i join sys.systab t on i.table_id=t.table_id
-          WHERE t.table_id = :table_id and i.index_category = 3 and i."unique"=2
-        """)
-
-        results = connection.execute(INDEX_SQL, table_id=table_id)
+        # fetched before the column queries, see get_foreign_keys()
+        results = self._execute_catalog(connection, UNIQUE_SQL,
+                                        table_id=table_id).fetchall()
         indexes = []
         for r in results:
-            INDEXCOL_SQL = text("""
-             select tc.column_name as col
-             FROM sys.sysidxcol ic
-             join sys.systabcol tc on (ic.table_id=tc.table_id and ic.column_id=tc.column_id)
-             WHERE ic.index_id = :index_id and ic.table_id = :table_id
-             ORDER BY ic.sequence ASC
-            """)
-            idx_cols = connection.execute(INDEXCOL_SQL, index_id=r["index_id"],
-                                          table_id=table_id)
+            idx_cols = self._execute_catalog(connection, UNIQUECOL_SQL,
+                                             index_id=r["index_id"],
+                                             table_id=table_id)
             column_names = [ic["col"] for ic in idx_cols]
             index_info = {"name": r["name"],
                           "column_names": column_names}
@@ -772,11 +2072,22 @@ class SQLAnyDialect(default.DefaultDialect):
         return indexes       
 
     @reflection.cache
-    def get_schema_names(self, connection, **kw):
+    def get_table_options(self, connection, table_name, schema=None, **kw):
+        row = self._get_table_row(connection, table_name, schema,
+                                  info_cache=kw.get("info_cache"))
+
+        options = {}
+        if row["pctfree"] is not None:
+            options["sqlany_pctfree"] = row["pctfree"]
+        if row["dbspace"] is not None and \
+                row["dbspace"].lower() != 'system':
+            options["sqlany_dbspace"] = row["dbspace"]
+        return options
 
-        SCHEMA_SQL = text("SELECT u.name AS name FROM dbo.sysusers u")
+    @reflection.cache
+    def get_schema_names(self, connection, **kw):
 
-        schemas = connection.execute(SCHEMA_SQL)
+        schemas = self._execute_catalog(connection, SCHEMA_SQL)
 
         return [s["name"] for s in schemas]
 
@@ -785,17 +2096,12 @@ class SQLAnyDialect(default.DefaultDialect):
         if schema is None:
             schema = self.default_schema_name
 
-        TABLE_SQL = text("""
-          SELECT t.table_name AS name
-          FROM sys.systab t JOIN dbo.sysusers u ON t.creator = u.uid
-          WHERE u.name = :schema_name and table_type <> 21
-        """)
-
         # Py2K
         if isinstance(schema, str):
             schema = schema.encode("ascii")
         # end Py2K
-        tables = connection.execute(TABLE_SQL, schema_name=schema)
+        tables = self._execute_catalog(connection, TABLE_SQL,
+                                       schema_name=schema)
 
         return [t["name"] for t in tables]
 
@@ -804,42 +2110,175 @@ class SQLAnyDialect(default.DefaultDialect):
         if schema is None:
             schema = self.default_schema_name
 
-        VIEW_DEF_SQL = text("""
-          SELECT v.view_def as text
-          FROM sys.sysview v JOIN sys.sysobject o ON v.view_object_id = o.object_id
-          join sys.systab t on o.object_id=t.object_id
-          WHERE t.table_name = :view_name
-            AND t.table_type = 21
-        """)
-
         # Py2K
         if isinstance(view_name, str):
             view_name = view_name.encode("ascii")
         # end Py2K
-        view = connection.execute(VIEW_DEF_SQL, view_name=view_name)
+        view = self._execute_catalog(connection, VIEW_DEF_SQL,
+                                     view_name=view_name)
 
         return view.scalar()
 
     @reflection.cache
-    def get_view_names(self, connection, schema=None, **kw):
+    def get_view_names(self, connection, schema=None,
+                       include=('plain', 'materialized'), **kw):
         if schema is None:
             schema = self.default_schema_name
 
-        VIEW_SQL = text("""
-          SELECT t.table_name AS name
-          FROM sys.systab t JOIN dbo.sysusers u ON t.creator = u.uid
-          WHERE u.name = :schema_name
-            AND t.table_type = 21
-        """)
+        table_types = []
+        if 'plain' in include:
+            table_types.append(21)
+        if 'materialized' in include:
+            table_types.append(2)
+        if not table_types:
+            return []
 
         # Py2K
         if isinstance(schema, str):
             schema = schema.encode("ascii")
         # end Py2K
-        views = connection.execute(VIEW_SQL, schema_name=schema)
+        views = self._execute_catalog(connection, VIEW_SQL[tuple(table_types)],
+                                      schema_name=schema)
 
         return [v["name"] for v in views]
 
+    def get_materialized_view_names(self, connection, schema=None, **kw):
+        return self.get_view_names(connection, schema,
+                                   include=('materialized',), **kw)
+
+    @reflection.cache
+    def get_materialized_view_options(self, connection, view_name,
+                                      schema=None, **kw):
+        if schema is None:
+            schema = self.default_schema_name
+
+        # Py2K
+        if isinstance(schema, str):
+            schema = schema.encode("ascii")
+        if isinstance(view_name, str):
+            view_name = view_name.encode("ascii")
+        # end Py2K
+        result = self._execute_catalog(connection, MATVIEW_SQL,
+                                       schema_name=schema,
+                                       view_name=view_name)
+        row = result.fetchone()
+        result.close()
+        if row is None:
+            raise exc.NoSuchTableError(view_name)
+
+        return {"refresh": "immediate" if row["refresh"] == 'I'
+                           else "manual",
+                "last_refreshed": row["last_refreshed"]}
+
+    def get_table_stats(self, connection, table_name, schema=None, **kw):
+        """Return the row and page counts of `table_name`.
+
+        The statistics of every table in the schema are fetched at once and
+        cached with the rest of the reflection data.
+
+        """
+        if schema is None:
+            schema = self.default_schema_name
+        stats = self._get_schema_table_stats(connection, schema, **kw)
+        if table_name not in stats:
+            raise exc.NoSuchTableError(table_name)
+        return stats[table_name]
+
+    @reflection.cache
+    def _get_schema_table_stats(self, connection, schema, **kw):
+        # Py2K
+        if isinstance(schema, str):
+            schema = schema.encode("ascii")
+        # end Py2K
+        results = self._execute_catalog(connection, TABLE_STATS_SQL,
+                                        schema_name=schema)
+
+        return dict((r["name"], {"row_count": r["row_count"],
+                                 "table_pages": r["table_pages"],
+                                 "ext_pages": r["ext_pages"],
+                                 "last_modified": r["last_modified"]})
+                    for r in results)
+
+    def get_column_histograms(self, connection, table_name, schema=None,
+                              **kw):
+        """Return the optimizer statistics of the columns of `table_name`.
+
+        The result maps each column that has statistics to its ``density``
+        (the average fraction of rows matching a single value), an estimate
+        of the number of distinct values and its ``histogram``, a list of
+        ``(low_value, high_value, frequency)`` buckets.  As with
+        :meth:`get_table_stats` the whole schema is read at once.
+
+        """
+        if schema is None:
+            schema = self.default_schema_name
+        histograms = self._get_schema_column_histograms(connection, schema,
+                                                        **kw)
+        if table_name in histograms:
+            return histograms[table_name]
+        if table_name in self._get_schema_table_stats(connection, schema,
+                                                      **kw):
+            return {}
+        raise exc.NoSuchTableError(table_name)
+
+    @reflection.cache
+    def _get_schema_column_histograms(self, connection, schema, **kw):
+        # Py2K
+        if isinstance(schema, str):
+            schema = schema.encode("ascii")
+        # end Py2K
+        histograms = {}
+        results = self._execute_catalog(connection, COLSTAT_SQL,
+                                        schema_name=schema)
+        for r in results:
+            density = r["density"]
+            histograms.setdefault(r["table_name"], {})[r["name"]] = {
+                "density": density,
+                "distinct": int(round(1 / density)) if density else None,
+                "update_count": r["update_count"],
+                "last_updated": r["last_updated"],
+                "histogram": [],
+            }
+
+        results = self._execute_catalog(connection, HISTOGRAM_SQL,
+                                        schema_name=schema)
+        for r in results:
+            column = histograms.get(r["table_name"], {}).get(r["name"])
+            if column is not None:
+                column["histogram"].append(
+                    (r["low_value"], r["high_value"], r["frequency"]))
+
+        return histograms
+
+    def has_sequence(self, connection, sequence_name, schema=None):
+        if schema is None:
+            schema = self.default_schema_name
+
+        # Py2K
+        if isinstance(schema, str):
+            schema = schema.encode("ascii")
+        if isinstance(sequence_name, str):
+            sequence_name = sequence_name.encode("ascii")
+        # end Py2K
+        result = self._execute_catalog(connection, SEQUENCE_SQL,
+                                       schema_name=schema,
+                                       sequence_name=sequence_name)
+        return result.scalar() is not None
+
+    @reflection.cache
+    def get_sequence_names(self, connection, schema=None, **kw):
+        if schema is None:
+            schema = self.default_schema_name
+
+        # Py2K
+        if isinstance(schema, str):
+            schema = schema.encode("ascii")
+        # end Py2K
+        sequences = self._execute_catalog(connection, SEQUENCES_SQL,
+                                          schema_name=schema)
+
+        return [s["name"] for s in sequences]
+
     def has_table(self, connection, table_name, schema=None):
         try:
             self.get_table_id(connection, table_name, schema)
@@ -853,6 +2292,7 @@ class SQLAnyDialect(default.DefaultDialect):
         Signal to SQLAlchemy whether *e* indicates that *connection* is
         broken and the pool needs to be recycled.
         """
-        if isinstance(e, sqlanydb.OperationalError):
-            return e.args[1] in (-101, -308,)
+        if isinstance(e, (self.dbapi.OperationalError,
+                          self.dbapi.InterfaceError)):
+            return len(e.args) > 1 and e.args[1] in _DISCONNECT_CODES
         return False
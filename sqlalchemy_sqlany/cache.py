@@ -0,0 +1,109 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+import collections
+import threading
+import time
+
+
+class ResultCache(object):
+    """A size-bounded LRU cache of raw result rows.
+
+    Entries are keyed by ``(statement, parameters)`` and remember the names
+    of the tables the statement selects from, so that DML against any of
+    those tables can invalidate them.  Rows are stored exactly as the DBAPI
+    returned them; type processing still happens in the result object on
+    every hit.
+
+    """
+
+    def __init__(self, size=128, ttl=60):
+        self.size = size
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._mutex = threading.Lock()
+
+    def get(self, key):
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires is not None and entry.expires < time.time():
+                    del self._entries[key]
+                    entry = None
+                else:
+                    # move to the most-recently-used end
+                    del self._entries[key]
+                    self._entries[key] = entry
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(self, key, tables, description, rows, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+        expires = time.time() + ttl if ttl else None
+        entry = _CacheEntry(tables, description, rows, expires)
+        with self._mutex:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, tables=None):
+        """Discard entries selecting from any of ``tables``, or all entries
+        if ``tables`` is None."""
+
+        with self._mutex:
+            if tables is None:
+                self._entries.clear()
+                return
+            tables = set(tables)
+            for key in [k for k, entry in self._entries.items()
+                        if not tables.isdisjoint(entry.tables)]:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _CacheEntry(object):
+    __slots__ = ('tables', 'description', 'rows', 'expires')
+
+    def __init__(self, tables, description, rows, expires):
+        self.tables = tables
+        self.description = description
+        self.rows = rows
+        self.expires = expires
+
+
+class CachedCursor(object):
+    """A read-only DBAPI cursor replaying the rows of a cache entry."""
+
+    arraysize = 1
+    lastrowid = None
+
+    def __init__(self, entry):
+        self.description = entry.description
+        self.rowcount = len(entry.rows)
+        self._rows = iter(entry.rows)
+
+    def execute(self, statement, parameters=None):
+        pass
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        return [row for i, row in zip(range(size), self._rows)]
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        self._rows = iter(())
@@ -0,0 +1,102 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+from sqlalchemy import exc
+from sqlalchemy.sql.ddl import DDLElement
+
+
+__all__ = ('CreateMaterializedView', 'DropMaterializedView',
+           'RefreshMaterializedView', 'AlterMaterializedView')
+
+
+REFRESH_TYPES = ('immediate', 'manual')
+
+
+class _MaterializedViewDDL(DDLElement):
+    def __init__(self, name, schema=None, on=None, bind=None):
+        self.name = name
+        self.schema = schema
+        self._check_ddl_on(on)
+        self.on = on
+        self.bind = bind
+
+
+class CreateMaterializedView(_MaterializedViewDDL):
+    """Represent a ``CREATE MATERIALIZED VIEW`` statement.
+
+    The view is created uninitialized; follow it with a
+    :class:`.RefreshMaterializedView` to populate it, and with an
+    :class:`.AlterMaterializedView` to make it refresh immediately.  Like
+    other DDL elements these can be attached to a ``MetaData`` so that the
+    view is managed along with the tables it is built on::
+
+        totals = select([orders.c.customer_id,
+                         func.sum(orders.c.amount).label('total')]).\\
+            group_by(orders.c.customer_id)
+
+        event.listen(metadata, 'after_create',
+                     CreateMaterializedView('order_totals', totals))
+        event.listen(metadata, 'after_create',
+                     RefreshMaterializedView('order_totals'))
+        event.listen(metadata, 'before_drop',
+                     DropMaterializedView('order_totals'))
+
+    Bound parameters in ``selectable`` are rendered inline.
+
+    """
+
+    __visit_name__ = 'create_materialized_view'
+
+    def __init__(self, name, selectable, schema=None, dbspace=None,
+                 on=None, bind=None):
+        super(CreateMaterializedView, self).__init__(name, schema, on, bind)
+        self.selectable = selectable
+        self.dbspace = dbspace
+
+
+class DropMaterializedView(_MaterializedViewDDL):
+    """Represent a ``DROP MATERIALIZED VIEW`` statement."""
+
+    __visit_name__ = 'drop_materialized_view'
+
+
+class RefreshMaterializedView(_MaterializedViewDDL):
+    """Represent a ``REFRESH MATERIALIZED VIEW`` statement.
+
+    :param isolation_level: rebuild the view ``WITH ISOLATION LEVEL``, e.g.
+     ``'snapshot'`` to avoid blocking writers to the underlying tables.
+
+    :param force_build: rebuild even if the view is not stale.
+
+    """
+
+    __visit_name__ = 'refresh_materialized_view'
+
+    def __init__(self, name, schema=None, isolation_level=None,
+                 force_build=False, on=None, bind=None):
+        super(RefreshMaterializedView, self).__init__(name, schema, on, bind)
+        self.isolation_level = isolation_level
+        self.force_build = force_build
+
+
+class AlterMaterializedView(_MaterializedViewDDL):
+    """Represent an ``ALTER MATERIALIZED VIEW`` statement changing the
+    refresh type.
+
+    :param refresh: ``'immediate'`` to maintain the view as the underlying
+     tables change (the view needs a unique index on non-nullable columns)
+     or ``'manual'`` to only update it with
+     :class:`.RefreshMaterializedView`.
+
+    """
+
+    __visit_name__ = 'alter_materialized_view'
+
+    def __init__(self, name, refresh, schema=None, on=None, bind=None):
+        super(AlterMaterializedView, self).__init__(name, schema, on, bind)
+        refresh = refresh.lower()
+        if refresh not in REFRESH_TYPES:
+            raise exc.ArgumentError(
+                "refresh must be one of %s; got %r" %
+                (", ".join(REFRESH_TYPES), refresh))
+        self.refresh = refresh
@@ -0,0 +1,210 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+from sqlalchemy import exc
+from sqlalchemy.sql import expression
+from sqlalchemy.sql.base import _generative, Executable
+from sqlalchemy.sql.dml import Insert as StandardInsert
+from sqlalchemy.sql.elements import ClauseElement, _literal_as_binds
+
+
+__all__ = ('Insert', 'insert', 'Merge', 'merge')
+
+
+ON_EXISTING_ACTIONS = ('error', 'update', 'skip')
+
+
+class Insert(StandardInsert):
+    """SQL Anywhere-specific implementation of INSERT.
+
+    Adds the ``ON EXISTING`` clause, which turns an INSERT into a single
+    statement upsert keyed on the primary key of the target table::
+
+        from sqlalchemy_sqlany import insert
+
+        stmt = insert(my_table).values(id=1, data='x').on_existing('update')
+
+    The statement may be executed with a list of parameter sets
+    (executemany) or with multiple VALUES rows.
+
+    """
+
+    _on_existing = None
+    _on_existing_defaults = None
+
+    @_generative
+    def on_existing(self, action='update', defaults=None):
+        """Specify the ``ON EXISTING`` clause.
+
+        :param action: one of ``'update'``, ``'skip'`` or ``'error'``.  With
+         ``'update'`` the existing row is overwritten with the inserted
+         values, with ``'skip'`` the row is left untouched, and ``'error'``
+         (the server default) raises a duplicate key error.
+
+        :param defaults: only valid together with ``'update'``; renders
+         ``DEFAULTS ON`` or ``DEFAULTS OFF`` to control whether columns not
+         present in the INSERT are reset to their defaults.
+
+        """
+        action = action.lower()
+        if action not in ON_EXISTING_ACTIONS:
+            raise exc.ArgumentError(
+                "on_existing() action must be one of %s; got %r" %
+                (", ".join(ON_EXISTING_ACTIONS), action))
+        if defaults is not None and action != 'update':
+            raise exc.ArgumentError(
+                "on_existing() 'defaults' is only valid with 'update'")
+        self._on_existing = action
+        self._on_existing_defaults = defaults
+
+
+def insert(table, *args, **kw):
+    """Construct a SQL Anywhere-specific :class:`.Insert`."""
+    return Insert(table, *args, **kw)
+
+
+class Merge(Executable, ClauseElement):
+    """Represent a SQL Anywhere ``MERGE`` statement.
+
+    The :class:`.Merge` object is created using the :func:`.merge`
+    function::
+
+        from sqlalchemy_sqlany import merge
+
+        src = select([staging]).\\
+            where(staging.c.batch_id == bindparam('batch_id')).alias('src')
+        stmt = merge(target).using(src).\\
+            on(target.c.id == src.c.id).\\
+            when_matched_then_update({'data': src.c.data}).\\
+            when_not_matched_then_insert({'id': src.c.id,
+                                          'data': src.c.data})
+
+    Each ``when_*`` method appends one ``WHEN ... THEN`` branch; branches are
+    rendered in the order they are added.
+
+    """
+
+    __visit_name__ = 'merge'
+
+    _execution_options = Executable._execution_options.union(
+        {"autocommit": True})
+
+    def __init__(self, table, bind=None):
+        self.table = expression._interpret_as_from(table)
+        self._bind = bind
+        self._source = None
+        self._on = None
+        self._clauses = []
+
+    @property
+    def bind(self):
+        return self._bind or self.table.bind
+
+    def _generate(self):
+        s = Executable._generate(self)
+        s._clauses = list(self._clauses)
+        return s
+
+    @_generative
+    def using(self, source):
+        """Set the source table, alias or aliased subquery."""
+        self._source = expression._interpret_as_from(source)
+
+    @_generative
+    def on(self, onclause):
+        """Set the search condition matching source rows to target rows."""
+        self._on = _literal_as_binds(onclause)
+
+    def _when(self, matched, action, values, whereclause):
+        if whereclause is not None:
+            whereclause = _literal_as_binds(whereclause)
+        if values is not None:
+            if isinstance(values, list) and values and \
+                    isinstance(values[0], tuple):
+                values = list(values)
+            elif isinstance(values, dict) and values:
+                values = list(values.items())
+            else:
+                raise exc.ArgumentError(
+                    "values must be a non-empty dictionary or list of "
+                    "2-tuples")
+        self._clauses.append(
+            MergeClause(matched, action, values, whereclause))
+
+    @_generative
+    def when_matched_then_update(self, values, whereclause=None):
+        """Add ``WHEN MATCHED THEN UPDATE SET ...``."""
+        self._when(True, 'update', values, whereclause)
+
+    @_generative
+    def when_matched_then_delete(self, whereclause=None):
+        """Add ``WHEN MATCHED THEN DELETE``."""
+        self._when(True, 'delete', None, whereclause)
+
+    @_generative
+    def when_matched_then_skip(self, whereclause=None):
+        """Add ``WHEN MATCHED THEN SKIP``."""
+        self._when(True, 'skip', None, whereclause)
+
+    @_generative
+    def when_not_matched_then_insert(self, values, whereclause=None):
+        """Add ``WHEN NOT MATCHED THEN INSERT (...) VALUES (...)``."""
+        self._when(False, 'insert', values, whereclause)
+
+    @_generative
+    def when_not_matched_then_skip(self, whereclause=None):
+        """Add ``WHEN NOT MATCHED THEN SKIP``."""
+        self._when(False, 'skip', None, whereclause)
+
+    def get_children(self, **kwargs):
+        children = [self.table]
+        if self._source is not None:
+            children.append(self._source)
+        if self._on is not None:
+            children.append(self._on)
+        for clause in self._clauses:
+            children.extend(clause.get_children())
+        return children
+
+    def _copy_internals(self, clone=expression._clone, **kw):
+        self.table = clone(self.table, **kw)
+        if self._source is not None:
+            self._source = clone(self._source, **kw)
+        if self._on is not None:
+            self._on = clone(self._on, **kw)
+        self._clauses = [clause._clone(clone, **kw)
+                         for clause in self._clauses]
+
+
+def merge(table, *args, **kw):
+    """Construct a :class:`.Merge` into the given target table."""
+    return Merge(table, *args, **kw)
+
+
+class MergeClause(object):
+    """One ``WHEN [NOT] MATCHED [AND ...] THEN ...`` branch of a MERGE."""
+
+    def __init__(self, matched, action, values, whereclause):
+        self.matched = matched
+        self.action = action
+        self.values = values
+        self.whereclause = whereclause
+
+    def get_children(self):
+        children = []
+        if self.whereclause is not None:
+            children.append(self.whereclause)
+        if self.values is not None:
+            children.extend(value for key, value in self.values
+                            if isinstance(value, ClauseElement))
+        return children
+
+    def _clone(self, clone, **kw):
+        values = whereclause = None
+        if self.whereclause is not None:
+            whereclause = clone(self.whereclause, **kw)
+        if self.values is not None:
+            values = [(key, clone(value, **kw)
+                       if isinstance(value, ClauseElement) else value)
+                      for key, value in self.values]
+        return MergeClause(self.matched, self.action, values, whereclause)
@@ -0,0 +1,55 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+from sqlalchemy import types as sqltypes
+from sqlalchemy.sql.elements import ColumnElement, _clone, \
+    _literal_as_binds
+
+
+__all__ = ('Contains', 'contains')
+
+
+class Contains(ColumnElement):
+    """Represent a ``CONTAINS()`` full text search condition.
+
+    The searched columns need a text index (see the ``sqlany_text`` option
+    of :class:`~sqlalchemy.schema.Index`).
+
+    """
+
+    __visit_name__ = 'contains'
+
+    type = sqltypes.Boolean()
+
+    _is_implicitly_boolean = True
+
+    def __init__(self, columns, query):
+        self.columns = list(columns)
+        self.query = _literal_as_binds(query, type_=sqltypes.String())
+
+    def get_children(self, **kwargs):
+        return self.columns + [self.query]
+
+    def _copy_internals(self, clone=_clone, **kw):
+        self.columns = [clone(c, **kw) for c in self.columns]
+        self.query = clone(self.query, **kw)
+
+
+def contains(columns, query):
+    """Construct a ``CONTAINS()`` full text search condition::
+
+        from sqlalchemy_sqlany import contains
+
+        stmt = select([docs.c.id]).\\
+            where(contains([docs.c.title, docs.c.body], 'index & cluster*'))
+
+    :param columns: a column or list of columns, all in the same text
+     index.
+
+    :param query: the full text query string, in the SQL Anywhere query
+     syntax.
+
+    """
+    if not isinstance(columns, (list, tuple)):
+        columns = [columns]
+    return Contains(columns, query)
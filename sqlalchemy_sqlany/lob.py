@@ -0,0 +1,309 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+import io
+
+from sqlalchemy import exc, func, select, types as sqltypes, util
+from sqlalchemy.sql import bindparam
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class _LOBReaderBase(object):
+    # server functions measuring and slicing the value, and the type whose
+    # result processor converts the slices
+    _length_func = 'byte_length'
+    _substr_func = 'byte_substr'
+    _result_type = None
+
+    def __init__(self, connection, column, whereclause,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        self.connection = connection
+        self.column = column
+        self.whereclause = whereclause
+        self.chunk_size = chunk_size
+        self._pos = 0
+        self._length = None
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence == io.SEEK_END:
+            offset += len(self)
+        if offset < 0:
+            raise ValueError("negative seek position %d" % offset)
+        self._pos = offset
+        return offset
+
+    def __len__(self):
+        if self._length is None:
+            self._length = self.connection.scalar(
+                select([getattr(func, self._length_func)(self.column)]).
+                where(self.whereclause)) or 0
+        return self._length
+
+    def _fetch(self, size):
+        chunk = self.connection.scalar(
+            select([getattr(func, self._substr_func)(
+                self.column, self._pos + 1, size,
+                type_=self._result_type)]).
+            where(self.whereclause))
+        if chunk:
+            self._pos += len(chunk)
+        return chunk
+
+
+class LOBReader(_LOBReaderBase, io.RawIOBase):
+    """Read a single LONG BINARY / IMAGE value in pieces.
+
+    Each :meth:`readinto` fetches at most one buffer's worth of the value
+    with ``BYTE_SUBSTR()``, so memory use is bounded by the chunk size
+    rather than by the size of the value.
+
+    """
+
+    def readinto(self, b):
+        size = min(len(b), self.chunk_size)
+        if not size:
+            return 0
+        chunk = self._fetch(size)
+        if not chunk:
+            return 0
+        n = len(chunk)
+        b[:n] = chunk
+        return n
+
+    def readall(self):
+        chunks = []
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+class LOBTextReader(_LOBReaderBase, io.TextIOBase):
+    """Read a single LONG VARCHAR / LONG NVARCHAR / UNITEXT value in
+    pieces.
+
+    As :class:`.LOBReader`, but positions and lengths count characters,
+    fetched with ``SUBSTR()`` and decoded by the column type's result
+    processor, so a multi-byte character is never split between two
+    pieces.
+
+    """
+
+    _length_func = 'length'
+    _substr_func = 'substr'
+
+    def __init__(self, connection, column, whereclause,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        super(LOBTextReader, self).__init__(connection, column, whereclause,
+                                            chunk_size)
+        self._result_type = column.type
+        # fetched but not yet read, ending at self._pos
+        self._buffer = u""
+
+    def tell(self):
+        return self._pos - len(self._buffer)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        offset = super(LOBTextReader, self).seek(offset, whence)
+        self._buffer = u""
+        return offset
+
+    def _fill(self):
+        chunk = self._fetch(self.chunk_size)
+        if not chunk:
+            return False
+        self._buffer += chunk
+        return True
+
+    def _take(self, size):
+        text, self._buffer = self._buffer[:size], self._buffer[size:]
+        return text
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            while self._fill():
+                pass
+            return self._take(len(self._buffer))
+        while len(self._buffer) < size and self._fill():
+            pass
+        return self._take(size)
+
+    def readline(self, size=-1):
+        while True:
+            end = self._buffer.find(u"\n")
+            if end >= 0:
+                end += 1
+                break
+            if not self._fill():
+                end = len(self._buffer)
+                break
+        if size is not None and 0 <= size < end:
+            end = size
+        return self._take(end)
+
+
+class _LOBWriterBase(object):
+    def __init__(self, connection, column, whereclause, append=False,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        self.connection = connection
+        self.column = column
+        self.chunk_size = chunk_size
+        self._append = append
+        self._found = False
+        value = bindparam('chunk', type_=self._bind_type(column))
+        table = column.table
+        self._exists = select([func.count()]).select_from(table).\
+            where(whereclause)
+        self._replace = table.update().where(whereclause).\
+            values({column: value})
+        self._concat = table.update().where(whereclause).\
+            values({column: column.concat(value)})
+
+    def writable(self):
+        return True
+
+    def _write(self, chunk):
+        if not self._found:
+            if not self.connection.scalar(self._exists):
+                raise exc.InvalidRequestError(
+                    "No row matched the LOB's WHERE clause")
+            self._found = True
+        stmt = self._concat if self._append else self._replace
+        self.connection.execute(stmt, chunk=chunk)
+        self._append = True
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+            if not self._append:
+                # 'wb' with nothing written still truncates the value
+                self._write(self._empty)
+        super(_LOBWriterBase, self).close()
+
+
+class LOBWriter(_LOBWriterBase, io.RawIOBase):
+    """Write a single LONG BINARY / IMAGE value in pieces.
+
+    The first :meth:`write` replaces the stored value unless ``append`` is
+    true; every subsequent write appends to it with ``||``, so only one
+    chunk needs to be held by the client at a time.  The row is looked up
+    before the first write, as the driver's rowcount isn't reliable enough
+    to tell whether an UPDATE matched it.
+
+    ``bytes`` chunks are bound as they are, other buffers are copied once
+    into a ``bytes`` chunk.
+
+    """
+
+    _empty = b""
+
+    def _bind_type(self, column):
+        return sqltypes.LargeBinary()
+
+    def write(self, b):
+        if self.closed:
+            raise ValueError("write to closed file")
+        if isinstance(b, bytes) and len(b) <= self.chunk_size:
+            chunk = b
+        else:
+            chunk = bytes(memoryview(b)[:self.chunk_size])
+        self._write(chunk)
+        return len(chunk)
+
+
+class LOBTextWriter(_LOBWriterBase, io.TextIOBase):
+    """Write a single LONG VARCHAR / LONG NVARCHAR / UNITEXT value in
+    pieces.
+
+    As :class:`.LOBWriter`, but written text is bound with the column's
+    type and collected into pieces of ``chunk_size`` characters, the last
+    of which is sent by :meth:`flush` or :meth:`close`.
+
+    """
+
+    _empty = u""
+
+    def __init__(self, connection, column, whereclause, append=False,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        super(LOBTextWriter, self).__init__(connection, column, whereclause,
+                                            append, chunk_size)
+        self._pending = []
+        self._pending_size = 0
+
+    def _bind_type(self, column):
+        return column.type
+
+    def write(self, s):
+        if self.closed:
+            raise ValueError("write to closed file")
+        if not isinstance(s, util.text_type):
+            raise TypeError("write() argument must be str, not %s" %
+                            type(s).__name__)
+        self._pending.append(s)
+        self._pending_size += len(s)
+        if self._pending_size >= self.chunk_size:
+            text = u"".join(self._pending)
+            end = len(text) - len(text) % self.chunk_size
+            for start in range(0, end, self.chunk_size):
+                self._write(text[start:start + self.chunk_size])
+            self._pending = [text[end:]] if end < len(text) else []
+            self._pending_size = len(text) - end
+        return len(s)
+
+    def flush(self):
+        if self._pending_size:
+            text = u"".join(self._pending)
+            self._pending = []
+            self._pending_size = 0
+            self._write(text)
+        super(LOBTextWriter, self).flush()
+
+
+def open_lob(connection, column, whereclause, mode='rb',
+             chunk_size=DEFAULT_CHUNK_SIZE):
+    """Open the value of ``column`` in the row matching ``whereclause`` as
+    a file object.
+
+    ``mode`` is ``'rb'`` to read, ``'wb'`` to replace the value or ``'ab'``
+    to append to it, for LONG BINARY / IMAGE columns; ``'r'``, ``'w'`` and
+    ``'a'`` do the same with text for LONG VARCHAR / LONG NVARCHAR /
+    UNITEXT columns, counting ``chunk_size`` in characters.  Reads and
+    writes go to the server in pieces of at most ``chunk_size``.  Run
+    writes inside a transaction so that a partially written value is
+    never visible to other connections::
+
+        with engine.begin() as conn:
+            with open_lob(conn, docs.c.body, docs.c.id == 5, 'wb') as f:
+                shutil.copyfileobj(src, f)
+
+    """
+    if mode == 'rb':
+        return io.BufferedReader(
+            LOBReader(connection, column, whereclause, chunk_size),
+            chunk_size)
+    elif mode in ('wb', 'ab'):
+        return io.BufferedWriter(
+            LOBWriter(connection, column, whereclause,
+                      append=(mode == 'ab'), chunk_size=chunk_size),
+            chunk_size)
+    elif mode == 'r':
+        return LOBTextReader(connection, column, whereclause, chunk_size)
+    elif mode in ('w', 'a'):
+        return LOBTextWriter(connection, column, whereclause,
+                             append=(mode == 'a'), chunk_size=chunk_size)
+    raise ValueError("invalid mode: %r" % mode)
@@ -0,0 +1,147 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+import collections
+import random
+import threading
+import time
+
+from sqlalchemy import exc
+
+from .base import _DISCONNECT_CODES
+
+
+__all__ = ('RetryPolicy', 'DEADLOCK', 'LOCK_TIMEOUT', 'DISCONNECT',
+           'classify')
+
+
+DEADLOCK = 'deadlock'
+LOCK_TIMEOUT = 'lock_timeout'
+DISCONNECT = 'disconnect'
+
+# SQLCODEs of transient errors: -306 deadlock detected, -307 all threads
+# blocked, -210 row locked by another connection (lock timeout)
+ERROR_CATEGORIES = dict([(-306, DEADLOCK), (-307, DEADLOCK),
+                         (-210, LOCK_TIMEOUT)] +
+                        [(code, DISCONNECT) for code in _DISCONNECT_CODES])
+
+
+def classify(error):
+    """Return the category of a transient error (``DEADLOCK``,
+    ``LOCK_TIMEOUT`` or ``DISCONNECT``) or None for other errors.
+    `error` may be the DBAPI exception or SQLAlchemy's wrapper of it."""
+
+    if isinstance(error, exc.DBAPIError):
+        error = error.orig
+    args = getattr(error, 'args', ())
+    if len(args) > 1:
+        return ERROR_CATEGORIES.get(args[1])
+    return None
+
+
+class RetryPolicy(object):
+    """Retry work failing with transient errors, with jittered exponential
+    backoff.
+
+    Passed to ``create_engine()`` the policy replays single statements
+    where that is safe::
+
+        policy = RetryPolicy(attempts=4)
+        engine = create_engine('sqlalchemy_sqlany://...', retry_policy=policy)
+
+    SELECTs, and statements with the ``sqlany_retry`` execution option set
+    to True, are replayed after a lock timeout and, outside of an explicit
+    transaction, after a deadlock (which rolls back the transaction).
+    ``sqlany_retry=False`` turns replays off for a statement.
+    ``executemany()`` calls are never replayed, as part of their rows may
+    already have been written when they fail.  A lost
+    connection can't be replayed on, so whole blocks of work can be
+    retried instead, on a fresh connection and transaction::
+
+        policy.transaction(engine, lambda conn: place_order(conn, order))
+        policy.run(checkout, session)    # checkout() commits the session
+
+    Retries are counted in :attr:`metrics`, per category and in total, as
+    well as the number of calls that ``recovered`` after retrying and the
+    number that were ``exhausted``.
+
+    :param attempts: the number of tries, including the first one.
+
+    :param backoff: the delay in seconds before the first retry; it doubles
+     with every retry, up to ``max_backoff``.  Each delay is drawn at
+     random between half and all of that, so that clients failing together
+     don't retry together.
+
+    :param retry_on: the categories of errors to retry.
+
+    """
+
+    def __init__(self, attempts=3, backoff=0.05, max_backoff=2.0,
+                 retry_on=(DEADLOCK, LOCK_TIMEOUT, DISCONNECT)):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = frozenset(retry_on)
+        self.metrics = collections.Counter()
+        self._mutex = threading.Lock()
+
+    def delay(self, attempt):
+        """The delay in seconds before retry number `attempt`."""
+
+        cap = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(cap / 2.0, cap)
+
+    def run(self, fn, *args, **kwargs):
+        """Call ``fn(*args, **kwargs)``, calling it again if it fails with a
+        retryable error, and return its result.  `fn` must leave nothing
+        half done when it fails, e.g. roll back its session."""
+
+        return self._call(self.retry_on, fn, args, kwargs)
+
+    def transaction(self, engine, fn):
+        """Call ``fn(connection)`` in a transaction on `engine`, replaying
+        the whole transaction on a retryable error."""
+
+        def attempt():
+            with engine.begin() as connection:
+                return fn(connection)
+        return self._call(self.retry_on, attempt, (), {})
+
+    def _execute(self, context, fn, *args):
+        # a statement run by the dialect; see the class docstring for what
+        # may be replayed
+        replay = context.execution_options.get('sqlany_retry')
+        if replay is None:
+            replay = context._is_read
+        if not replay:
+            return fn(*args)
+        if context.root_connection.in_transaction():
+            categories = self.retry_on & set([LOCK_TIMEOUT])
+        else:
+            categories = self.retry_on & set([DEADLOCK, LOCK_TIMEOUT])
+        return self._call(categories, fn, args, {})
+
+    def _call(self, categories, fn, args, kwargs):
+        attempt = 1
+        while True:
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as err:
+                category = classify(err)
+                if category is None or category not in categories:
+                    raise
+                if attempt >= self.attempts:
+                    self._count('exhausted')
+                    raise
+                self._count('retries', category)
+                time.sleep(self.delay(attempt))
+                attempt += 1
+            else:
+                if attempt > 1:
+                    self._count('recovered')
+                return result
+
+    def _count(self, *keys):
+        with self._mutex:
+            for key in keys:
+                self.metrics[key] += 1
@@ -0,0 +1,147 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+import itertools
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import UpdateBase
+
+
+__all__ = ('ReplicaRouter', 'RoutingSession')
+
+
+class ReplicaRouter(object):
+    """Send read-only work to read-only scale-out copy nodes and
+    everything else to the primary.
+
+    ``primary`` and ``replicas`` are engines created as usual, one per
+    node; each keeps its own connection pool::
+
+        router = ReplicaRouter(
+            create_engine('sqlalchemy_sqlany://app:pw@primary/db'),
+            [create_engine('sqlalchemy_sqlany://app:pw@copy1/db'),
+             create_engine('sqlalchemy_sqlany://app:pw@copy2/db')])
+
+        with router.connect(readonly=True) as conn:
+            conn.execute(report_query)
+
+        router.execute(select([orders]).execution_options(readonly=True))
+
+    Read-only work is spread over the copy nodes in turn.  A node on which
+    any connection fails with an error the dialect considers a disconnect
+    (see ``SQLAnyDialect.is_disconnect``) is left out for
+    ``retry_interval`` seconds; work the router was routing at the time
+    goes to the next node, or to the primary when no copy node is
+    available.
+
+    """
+
+    def __init__(self, primary, replicas, retry_interval=30):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.retry_interval = retry_interval
+        self._down = {}
+        self._turn = itertools.count()
+        self._mutex = threading.Lock()
+        for engine in self.replicas:
+            event.listen(engine, 'handle_error', self._check_disconnect)
+
+    def _check_disconnect(self, context):
+        if context.is_disconnect:
+            self.mark_down(context.engine)
+
+    def healthy_replicas(self):
+        """The copy nodes not marked down, starting with the one whose
+        turn it is."""
+
+        now = time.time()
+        with self._mutex:
+            for engine, until in list(self._down.items()):
+                if until <= now:
+                    del self._down[engine]
+            if not self.replicas:
+                return []
+            start = next(self._turn) % len(self.replicas)
+            return [engine for engine in
+                    self.replicas[start:] + self.replicas[:start]
+                    if engine not in self._down]
+
+    def mark_down(self, engine):
+        """Leave `engine` out of the rotation for ``retry_interval``
+        seconds."""
+
+        with self._mutex:
+            self._down[engine] = time.time() + self.retry_interval
+
+    def get_engine(self, readonly=False):
+        """Return the engine of the node read-only or read-write work
+        should currently go to."""
+
+        if readonly:
+            for engine in self.healthy_replicas():
+                return engine
+        return self.primary
+
+    def connect(self, readonly=False):
+        """Return a ``Connection`` to the primary, or to a copy node if
+        `readonly` is true."""
+
+        return self._failover(readonly, lambda engine: engine.connect())
+
+    def execute(self, statement, *multiparams, **params):
+        """Execute `statement` in autocommit mode, on a copy node if it has
+        the ``readonly`` execution option.  A read-only statement failing
+        with a disconnect is retried on the next node."""
+
+        options = getattr(statement, '_execution_options', {})
+        return self._failover(
+            options.get('readonly', False),
+            lambda engine: engine.execute(statement, *multiparams, **params))
+
+    def _failover(self, readonly, fn):
+        if readonly:
+            for engine in self.healthy_replicas():
+                try:
+                    return fn(engine)
+                except exc.DBAPIError as err:
+                    if not err.connection_invalidated:
+                        raise
+        return fn(self.primary)
+
+
+class RoutingSession(Session):
+    """A ``Session`` whose reads go to a copy node of a
+    :class:`.ReplicaRouter` when created with ``readonly=True``::
+
+        Session = sessionmaker(class_=RoutingSession, router=router)
+        session = Session(readonly=True)
+
+    Each transaction stays on one node.  Flushes and INSERT, UPDATE or
+    DELETE statements always go to the primary.
+
+    """
+
+    def __init__(self, router=None, readonly=False, **kwargs):
+        super(RoutingSession, self).__init__(**kwargs)
+        self.router = router
+        self.readonly = readonly
+        self._replica = None
+        event.listen(self, 'after_transaction_end', self._release_replica)
+
+    def get_bind(self, mapper=None, clause=None):
+        if self.router is None:
+            return super(RoutingSession, self).get_bind(mapper, clause)
+        if not self.readonly or self._flushing or \
+                isinstance(clause, UpdateBase):
+            return self.router.primary
+        if self._replica is None:
+            self._replica = self.router.get_engine(readonly=True)
+        return self._replica
+
+    @staticmethod
+    def _release_replica(session, transaction):
+        if transaction.parent is None:
+            session._replica = None
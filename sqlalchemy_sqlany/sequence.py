@@ -0,0 +1,55 @@
+# Copyright 2015 SAP AG or an SAP affiliate company.
+#
+
+
+class SequenceAllocator(object):
+    """Hand out key values from blocks reserved with a single ``nextval``.
+
+    Each ``nextval`` of ``sequence`` reserves the next
+    ``sequence.increment`` values; the allocator hands them out one at a
+    time from a block kept per database connection, so only one round trip
+    is needed per block rather than per row.  Sessions that use the
+    sequence directly still get unique values, they just skip a block.
+
+    The allocator is a Python-side column default, so the keys are known
+    before the INSERT runs and no ``SELECT @@identity`` follows it::
+
+        order_seq = Sequence('order_id_seq', increment=100,
+                             metadata=metadata)
+        orders = Table('orders', metadata,
+                       Column('id', Integer, primary_key=True,
+                              default=SequenceAllocator(order_seq)),
+                       ...)
+
+    The ORM only batches INSERTs whose primary keys are already set, which
+    can be done with :meth:`next_value` in a ``before_insert`` listener::
+
+        @event.listens_for(Order, 'before_insert')
+        def assign_id(mapper, connection, target):
+            target.id = order_ids.next_value(connection)
+
+    """
+
+    def __init__(self, sequence):
+        if not sequence.increment or sequence.increment < 1:
+            raise ValueError(
+                "Sequence %r must have a positive increment to be used "
+                "for block allocation" % sequence.name)
+        self.sequence = sequence
+        self.block_size = sequence.increment
+        self._key = ('sqlany_sequence_block', sequence.schema, sequence.name)
+
+    def next_value(self, connection):
+        """Return the next key value, reserving a new block from the
+        sequence on `connection` if the current one is used up."""
+
+        info = connection.info
+        value, end = info.get(self._key, (0, 0))
+        if value >= end:
+            value = connection.execute(self.sequence)
+            end = value + self.block_size
+        info[self._key] = (value + 1, end)
+        return value
+
+    def __call__(self, context):
+        return self.next_value(context.connection)
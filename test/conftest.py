@@ -1,5 +1,6 @@
 from sqlalchemy.dialects import registry
 
 registry.register("sqlalchemy_sqlany", "sqlalchemy_sqlany.base", "dialect")
+registry.register("sqlany", "sqlalchemy_sqlany.base", "dialect")
 
 from sqlalchemy.testing.plugin.pytestplugin import *
@@ -0,0 +1,375 @@
+"""An in-memory, scripted stand-in for the sqlanydb module.
+
+Tests pass an instance as the ``module`` argument of ``create_engine()``::
+
+    dbapi = FakeDBAPI()
+    dbapi.add_result(r"FROM lookup", [(1, 'a')], columns=('id', 'name'))
+    engine = create_engine('sqlalchemy_sqlany://', module=dbapi)
+
+Statements are matched against the scripted responses in order of
+registration (most recent first); everything executed is recorded in
+``dbapi.statements`` and each cursor ``execute()`` / ``executemany()``
+call in ``dbapi.calls``.  :func:`script_catalog` scripts enough of the
+system tables for reflection.
+
+Setting ``dbapi.connect_error`` to an exception makes new connections
+fail with it.  Connections keep the values set with ``SET TEMPORARY
+OPTION``, also inside ``BEGIN ... END`` batches, and answer unscripted
+``CONNECTION_PROPERTY()`` queries from them.  The statements of the
+dialect's rowcount batches (``BEGIN ... SET x = @@rowcount ... END``) are
+each answered from the script, but recorded as the one batch.
+
+The module may be shared by many threads.  ``dbapi.latency`` seconds are
+spent in every ``execute()`` / ``executemany()``, as a stand-in for the
+network, and a connection used by two threads at once is recorded in
+``dbapi.violations`` (sqlanydb's connections are not thread safe).
+
+"""
+
+import re
+import threading
+import time
+
+
+_SET_OPTION_RE = re.compile(r"SET TEMPORARY OPTION (\w+) = '((?:[^']|'')*)'",
+                            re.I)
+_PROPERTY_RE = re.compile(r"CONNECTION_PROPERTY\('(\w+)'\)", re.I)
+_ROWCOUNT_RE = re.compile(r"^SET \w+ = @@rowcount$", re.I)
+
+
+class Error(Exception):
+    pass
+
+
+class Warning(Exception):
+    pass
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+class InternalError(DatabaseError):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class IntegrityError(DatabaseError):
+    pass
+
+
+class DataError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+class Binary(bytes):
+    pass
+
+
+class Result(object):
+    """A scripted response: rows and column names, or an error."""
+
+    def __init__(self, rows=(), columns=None, rowcount=None, error=None):
+        self.rows = list(rows)
+        if columns is not None:
+            self.description = [(name, None, None, None, None, None, None)
+                                for name in columns]
+        else:
+            self.description = None
+        if rowcount is None:
+            rowcount = len(self.rows) if columns is None else -1
+        self.rowcount = rowcount
+        self.error = error
+
+
+class FakeDBAPI(object):
+    paramstyle = 'qmark'
+    apilevel = '2.0'
+    threadsafety = 1
+
+    Error = Error
+    Warning = Warning
+    InterfaceError = InterfaceError
+    DatabaseError = DatabaseError
+    InternalError = InternalError
+    OperationalError = OperationalError
+    ProgrammingError = ProgrammingError
+    IntegrityError = IntegrityError
+    DataError = DataError
+    NotSupportedError = NotSupportedError
+    Binary = Binary
+
+    def __init__(self, server_version='17.0.4.2053', user='DBA'):
+        self.statements = []
+        self.calls = []
+        self.connections = []
+        self.connect_error = None
+        self.latency = 0
+        self.violations = []
+        self._mutex = threading.Lock()
+        self._script = []
+        self.add_result(r"^SELECT current user", [(user,)],
+                        columns=('user_name',))
+        self.add_result(r"^select @@version", [(server_version,)],
+                        columns=('@@version',))
+        self.add_result(r"^SELECT @@identity", [(1,)],
+                        columns=('lastrowid',))
+        self.add_result(r"test (plain|unicode) returns", [(u'x',)],
+                        columns=('anon_1',))
+
+    def add_result(self, pattern, rows=(), columns=None, rowcount=None):
+        """Answer statements matching ``pattern`` with the given rows.
+
+        ``rows`` may also be a callable receiving ``(statement,
+        parameters)`` and returning a :class:`.Result`.
+        """
+        if callable(rows):
+            response = rows
+        else:
+            result = Result(rows, columns, rowcount)
+            response = lambda statement, parameters: result
+        self._script.insert(0, (re.compile(pattern, re.I), response))
+
+    def add_error(self, pattern, sqlcode, message='error',
+                  errorclass=OperationalError, times=None):
+        """Raise ``errorclass(message, sqlcode)`` for matching statements,
+        at most ``times`` times if given."""
+
+        remaining = [times]
+
+        def response(statement, parameters):
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return None
+                remaining[0] -= 1
+            return Result(error=errorclass(message, sqlcode))
+        self._script.insert(0, (re.compile(pattern, re.I), response))
+
+    def executed(self, pattern):
+        """The recorded (statement, parameters) matching ``pattern``."""
+        regex = re.compile(pattern, re.I)
+        return [(s, p) for s, p in self.statements if regex.search(s)]
+
+    def _respond(self, statement, parameters, options=None, record=True):
+        if record:
+            with self._mutex:
+                self.statements.append((statement, parameters))
+        if statement.startswith('BEGIN\n') and '@@rowcount' in statement:
+            return self._respond_batch(statement, parameters, options)
+        for regex, response in self._script:
+            if regex.search(statement):
+                result = response(statement, parameters)
+                if result is not None:
+                    return result
+        if options is not None:
+            names = _PROPERTY_RE.findall(statement)
+            if names:
+                return Result([tuple(options.get(name.lower())
+                                     for name in names)],
+                              columns=names)
+        return Result()
+
+    def _respond_batch(self, statement, parameters, options):
+        parameters = list(parameters)
+        rowcounts = []
+        result = None
+        for part in statement[len('BEGIN\n'):-len(';\nEND')].split(';\n'):
+            if part.startswith('DECLARE '):
+                continue
+            elif _ROWCOUNT_RE.match(part):
+                rowcounts.append(result.rowcount)
+            elif part.startswith('SELECT '):
+                return Result([tuple(rowcounts)], columns=[
+                    name.strip() for name in part[7:].split(',')])
+            else:
+                count = part.count('?')
+                params, parameters = parameters[:count], parameters[count:]
+                result = self._respond(part, params, options, record=False)
+                if result.error is not None:
+                    return result
+        return Result()
+
+    def connect(self, *args, **kwargs):
+        if self.connect_error is not None:
+            raise self.connect_error
+        conn = Connection(self, kwargs)
+        with self._mutex:
+            self.connections.append(conn)
+        return conn
+
+
+class Connection(object):
+    def __init__(self, dbapi, params):
+        self.dbapi = dbapi
+        self.params = params
+        self.closed = False
+        self.commits = self.rollbacks = 0
+        self.options = {'isolation_level': '0', 'chained': 'On'}
+        self._thread = None
+
+    def _enter(self, operation):
+        thread = threading.current_thread().name
+        with self.dbapi._mutex:
+            if self._thread is not None:
+                self.dbapi.violations.append(
+                    "%s: %s while %s used the connection" %
+                    (thread, operation, self._thread))
+            self._thread = thread
+
+    def _exit(self):
+        self._thread = None
+
+    def cursor(self):
+        if self.closed:
+            raise InterfaceError("not connected", -101)
+        return Cursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class Cursor(object):
+    arraysize = 1
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self._rows = iter(())
+
+    def execute(self, operation, parameters=()):
+        self._call('execute', self._execute, operation, parameters)
+
+    def _call(self, name, fn, *args):
+        dbapi = self.connection.dbapi
+        with dbapi._mutex:
+            dbapi.calls.append(name)
+        self.connection._enter(name)
+        try:
+            if dbapi.latency:
+                time.sleep(dbapi.latency)
+            fn(*args)
+        finally:
+            self.connection._exit()
+
+    def _execute(self, operation, parameters):
+        if isinstance(operation, bytes):
+            operation = operation.decode('utf-8')
+        options = self.connection.options
+        result = self.connection.dbapi._respond(operation, parameters,
+                                                options)
+        if result.error is not None:
+            raise result.error
+        for match in _SET_OPTION_RE.finditer(operation):
+            name, value = match.groups()
+            options[name.lower()] = value.replace("''", "'")
+        self.description = result.description
+        self.rowcount = result.rowcount
+        self._rows = iter(result.rows)
+
+    def executemany(self, operation, seq_of_parameters):
+        self._call('executemany', self._executemany, operation,
+                   seq_of_parameters)
+
+    def _executemany(self, operation, seq_of_parameters):
+        rowcount = 0
+        for parameters in seq_of_parameters:
+            self._execute(operation, parameters)
+            rowcount += max(self.rowcount, 0)
+        self.rowcount = rowcount
+
+    def fetchone(self):
+        return next(self._rows, None)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        return [row for i, row in zip(range(size), self._rows)]
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        self._rows = iter(())
+
+
+INDEX_COLUMNS = ('index_id', 'name', 'unique', 'clustered', 'dbspace',
+                 'is_text', 'text_configuration', 'refresh_type',
+                 'refresh_interval')
+
+
+def script_catalog(dbapi, ncolumns=10, nindexes=3, schema='DBA'):
+    """Script the system tables for reflecting table ``t`` (table id 100)
+    with ``ncolumns`` integer/varchar columns, ``nindexes`` single column
+    indexes and a foreign key to table ``parent`` (table id 101)."""
+
+    tables = {100: 't', 101: 'parent'}
+    columns = [('c%d' % i, 'integer' if i % 2 else 'varchar')
+               for i in range(1, ncolumns + 1)]
+
+    def table_id(statement, parameters):
+        name = parameters[-1]
+        if isinstance(name, bytes):
+            name = name.decode('ascii')
+        ids = dict((name, id_) for id_, name in tables.items())
+        return Result([(ids[name], None, 'system')] if name in ids else [],
+                      columns=('id', 'pctfree', 'dbspace'))
+    dbapi.add_result(r"SELECT t\.table_id AS id", table_id)
+
+    dbapi.add_result(
+        r"SELECT col\.column_name AS name",
+        [(name, type_, 1, 0, None, 10 if type_ == 'integer' else 30, 0,
+          10 if type_ == 'integer' else 30, 0, None, None)
+         for name, type_ in columns],
+        columns=('name', 'type', 'nullable', 'autoincrement', 'default',
+                 'precision', 'scale', 'length', 'compressed', 'inline',
+                 'prefix'))
+    dbapi.add_result(
+        r"SELECT c\.column_id AS id, c\.column_name AS name",
+        [(i, name) for i, (name, type_) in enumerate(columns, 1)],
+        columns=('id', 'name'))
+    dbapi.add_result(
+        r"SELECT fk\.foreign_index_id",
+        [(10, 'fk_parent', 101)],
+        columns=('foreign_index_id', 'name', 'reftable_id'))
+    dbapi.add_result(
+        r"SELECT t\.table_name AS name, u\.name AS \"schema\"",
+        [('parent', schema)], columns=('name', 'schema'))
+    dbapi.add_result(
+        r"as fokey", [(2, 1)], columns=('fokey', 'refkey'))
+    dbapi.add_result(
+        r"SELECT i\.index_id as index_id, i\.index_name AS name",
+        [(i, 'ix_%d' % i, 0, 0, 'system', 0, None, None, None)
+         for i in range(1, nindexes + 1)],
+        columns=INDEX_COLUMNS)
+    dbapi.add_result(
+        r"select tc\.column_name as col", [('c1', 'A')],
+        columns=('col', 'order'))
+    dbapi.add_result(
+        r"SELECT t\.table_name AS table_name, i\.index_id as index_id",
+        [('t', 0, 'pk_t', 0)],
+        columns=('table_name', 'index_id', 'name', 'clustered'))
+    dbapi.add_result(
+        r"SELECT t\.table_name AS name\s+FROM sys\.systab",
+        [(name,) for name in tables.values()], columns=('name',))
@@ -29,49 +29,67 @@ class Requirements(SuiteRequirements):
         """target dialect supports representation of Python
         datetime.datetime() objects."""
 
-        return exclusions.closed()
+        return exclusions.open()
 
     @property
     def datetime_microseconds(self):
         """target dialect supports representation of Python
         datetime.datetime() with microsecond objects."""
 
-        return exclusions.closed()
+        return exclusions.open()
 
     @property
     def datetime_historic(self):
         """target dialect supports representation of Python
         datetime.datetime() objects with historic (pre 1900) values."""
 
-        return exclusions.closed()
+        return exclusions.open()
 
     @property
     def date(self):
         """target dialect supports representation of Python
         datetime.date() objects."""
 
-        return exclusions.closed()
+        return exclusions.open()
 
     @property
     def date_historic(self):
         """target dialect supports representation of Python
         datetime.datetime() objects with historic (pre 1900) values."""
 
-        return exclusions.closed()
+        return exclusions.open()
 
     @property
     def time(self):
         """target dialect supports representation of Python
         datetime.time() objects."""
 
-        return exclusions.closed()
+        return exclusions.open()
 
     @property
     def time_microseconds(self):
         """target dialect supports representation of Python
         datetime.time() with microsecond objects."""
 
-        return exclusions.closed()
+        return exclusions.open()
+
+    @property
+    def isolation_level(self):
+        return exclusions.open()
+
+    @property
+    def autocommit(self):
+        return exclusions.open()
+
+    def get_isolation_levels(self, config):
+        return {
+            "default": "READ UNCOMMITTED",
+            "supported": [
+                "READ UNCOMMITTED", "READ COMMITTED", "REPEATABLE READ",
+                "SERIALIZABLE", "SNAPSHOT", "STATEMENT SNAPSHOT",
+                "READONLY STATEMENT SNAPSHOT", "AUTOCOMMIT"
+            ]
+        }
 
     @property
     def order_by_col_from_union(self):
@@ -80,7 +98,7 @@ class Requirements(SuiteRequirements):
         E.g.  (SELECT id, ...) UNION (SELECT id, ...) ORDER BY id
         """
 
-        return exclusions.closed()
+        return exclusions.open()
 
     @property
     def cross_schema_fk_reflection(self):
@@ -0,0 +1,41 @@
+from sqlalchemy.testing import eq_, fixtures
+
+from . import benchmark
+
+
+class BenchmarkBaselineTest(fixtures.TestBase):
+    """Round-trip counts are exact, so unlike the timing metrics they are
+    checked on every test run."""
+
+    def test_round_trip_counts(self):
+        results = benchmark.run(kinds=(benchmark.COUNT,))
+        baseline = benchmark.load_baseline()
+        eq_(benchmark.compare(results, baseline), [])
+
+    def test_compare(self):
+        baseline = {'tolerance': 0.5, 'metrics': {
+            'a': {'value': 100.0, 'kind': benchmark.RATE},
+            'b': {'value': 100.0, 'kind': benchmark.RATE,
+                  'tolerance': 0.1},
+            'c': {'value': 3, 'kind': benchmark.COUNT}}}
+        results = {
+            'a': {'value': 60.0, 'kind': benchmark.RATE},
+            'b': {'value': 85.0, 'kind': benchmark.RATE},
+            'c': {'value': 4, 'kind': benchmark.COUNT},
+            'd': {'value': 1, 'kind': benchmark.COUNT}}
+        eq_(benchmark.compare(results, baseline),
+            [('b', 85.0, 100.0), ('c', 4, 3)])
+
+    def test_compare_calibrated(self):
+        # on a machine half as fast as the baseline's, half the rate is
+        # no regression; counts aren't scaled
+        baseline = {'tolerance': 0.1, 'calibration': 1000.0, 'metrics': {
+            'a': {'value': 100.0, 'kind': benchmark.RATE},
+            'b': {'value': 100.0, 'kind': benchmark.RATE},
+            'c': {'value': 3, 'kind': benchmark.COUNT}}}
+        results = {
+            'a': {'value': 50.0, 'kind': benchmark.RATE},
+            'b': {'value': 40.0, 'kind': benchmark.RATE},
+            'c': {'value': 4, 'kind': benchmark.COUNT}}
+        eq_(benchmark.compare(results, baseline, calibration=500.0),
+            [('b', 40.0, 50.0), ('c', 4, 3)])
@@ -0,0 +1,690 @@
+import datetime
+import decimal
+
+from sqlalchemy import Column, Date, Index, Integer, LargeBinary, MetaData, \
+    Numeric, PrimaryKeyConstraint, Sequence, String, Table
+from sqlalchemy import Text, TypeDecorator, bindparam, exc, func, select, union
+from sqlalchemy.schema import CreateIndex, CreateSequence, CreateTable, \
+    DropSequence
+from sqlalchemy.testing import AssertsCompiledSQL, assert_raises, \
+    assert_raises_message, eq_, fixtures
+
+from sqlalchemy_sqlany import AlterMaterializedView, \
+    CreateMaterializedView, DropMaterializedView, RefreshMaterializedView, \
+    base, contains, insert, merge
+from sqlalchemy.schema import DropIndex
+from sqlalchemy.sql import util as sql_util, visitors
+
+
+class UpsertCompileTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect(paramstyle='qmark')
+
+    def setup(self):
+        m = MetaData()
+        self.table = Table(
+            'mytable', m,
+            Column('id', Integer, primary_key=True, autoincrement=False),
+            Column('name', String(30)),
+            Column('data', String(30)))
+
+    def test_on_existing_update(self):
+        stmt = insert(self.table).on_existing('update')
+        self.assert_compile(
+            stmt,
+            "INSERT INTO mytable (id, name, data) ON EXISTING UPDATE "
+            "VALUES (?, ?, ?)",
+            checkpositional=('x', 'y', 'z'),
+            params={'id': 'x', 'name': 'y', 'data': 'z'})
+
+    def test_on_existing_skip(self):
+        stmt = insert(self.table).values(id=1, name='n').on_existing('skip')
+        self.assert_compile(
+            stmt,
+            "INSERT INTO mytable (id, name) ON EXISTING SKIP "
+            "VALUES (?, ?)")
+
+    def test_on_existing_error(self):
+        stmt = insert(self.table).values(id=1).on_existing('error')
+        self.assert_compile(
+            stmt,
+            "INSERT INTO mytable (id) ON EXISTING ERROR VALUES (?)")
+
+    def test_on_existing_update_defaults(self):
+        stmt = insert(self.table).values(id=1).\
+            on_existing('update', defaults=False)
+        self.assert_compile(
+            stmt,
+            "INSERT INTO mytable (id) ON EXISTING UPDATE DEFAULTS OFF "
+            "VALUES (?)")
+
+    def test_on_existing_multivalues(self):
+        stmt = insert(self.table).values(
+            [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]).\
+            on_existing('update')
+        self.assert_compile(
+            stmt,
+            "INSERT INTO mytable (id, name) ON EXISTING UPDATE "
+            "VALUES (?, ?), (?, ?)",
+            checkpositional=(1, 'a', 2, 'b'))
+
+    def test_on_existing_from_select(self):
+        src = select([self.table.c.id, self.table.c.name])
+        stmt = insert(self.table).from_select(['id', 'name'], src).\
+            on_existing('skip')
+        self.assert_compile(
+            stmt,
+            "INSERT INTO mytable (id, name) ON EXISTING SKIP "
+            "SELECT mytable.id, mytable.name FROM mytable")
+
+    def test_on_existing_quoted_columns(self):
+        t = Table('t', MetaData(),
+                  Column('weird (col)', Integer, primary_key=True),
+                  Column('values', Integer))
+        stmt = insert(t).values({'weird (col)': 1, 'values': 2}).\
+            on_existing('update')
+        self.assert_compile(
+            stmt,
+            'INSERT INTO t ("weird (col)", "values") ON EXISTING UPDATE '
+            'VALUES (?, ?)')
+
+    def test_on_existing_schema_and_prefix(self):
+        t = Table('my table', MetaData(),
+                  Column('id', Integer, primary_key=True),
+                  schema='owner')
+        stmt = insert(t).values(id=1).prefix_with('/* p */').\
+            on_existing('skip')
+        self.assert_compile(
+            stmt,
+            'INSERT /* p */ INTO owner."my table" (id) ON EXISTING SKIP '
+            'VALUES (?)')
+
+    def test_on_existing_bad_action(self):
+        assert_raises(exc.ArgumentError,
+                      insert(self.table).on_existing, 'replace')
+        assert_raises(exc.ArgumentError,
+                      insert(self.table).on_existing, 'skip', defaults=True)
+
+    def test_on_existing_empty(self):
+        t = Table('t', MetaData(), Column('id', Integer, primary_key=True))
+        stmt = insert(t).on_existing('skip')
+        assert_raises_message(
+            exc.CompileError, "requires at least one column value",
+            stmt.compile, dialect=self.__dialect__, column_keys=[])
+
+    def test_on_existing_returning(self):
+        stmt = insert(self.table).values(id=1).on_existing('update').\
+            returning(self.table.c.id)
+        assert_raises_message(
+            exc.CompileError, "RETURNING is not supported",
+            stmt.compile, dialect=self.__dialect__)
+
+    def test_plain_insert_unchanged(self):
+        self.assert_compile(
+            insert(self.table).values(id=1),
+            "INSERT INTO mytable (id) VALUES (?)")
+
+    def test_merge_from_bound_select(self):
+        staging = Table('staging', MetaData(),
+                        Column('batch_id', Integer),
+                        Column('id', Integer),
+                        Column('name', String(30)))
+        src = select([staging.c.id, staging.c.name]).\
+            where(staging.c.batch_id == bindparam('batch_id')).alias('src')
+        stmt = merge(self.table).using(src).\
+            on(self.table.c.id == src.c.id).\
+            when_matched_then_update({'name': src.c.name}).\
+            when_not_matched_then_insert([('id', src.c.id),
+                                          ('name', src.c.name)])
+        self.assert_compile(
+            stmt,
+            "MERGE INTO mytable USING (SELECT staging.id AS id, "
+            "staging.name AS name FROM staging "
+            "WHERE staging.batch_id = ?) AS src "
+            "ON mytable.id = src.id "
+            "WHEN MATCHED THEN UPDATE SET name = src.name "
+            "WHEN NOT MATCHED THEN INSERT (id, name) "
+            "VALUES (src.id, src.name)",
+            checkpositional=(5,),
+            params={'batch_id': 5})
+
+    def test_merge_from_table(self):
+        other = Table('other', MetaData(),
+                      Column('id', Integer, primary_key=True),
+                      Column('name', String(30)))
+        stmt = merge(self.table).using(other).\
+            on(self.table.c.id == other.c.id).\
+            when_matched_then_delete(other.c.name == None).\
+            when_matched_then_update({self.table.c.data: 'changed'}).\
+            when_not_matched_then_skip()
+        self.assert_compile(
+            stmt,
+            "MERGE INTO mytable USING other ON mytable.id = other.id "
+            "WHEN MATCHED AND other.name IS NULL THEN DELETE "
+            "WHEN MATCHED THEN UPDATE SET data = ? "
+            "WHEN NOT MATCHED THEN SKIP",
+            checkpositional=('changed',))
+
+    def test_merge_when_clause_binds(self):
+        other = Table('other', MetaData(),
+                      Column('id', Integer, primary_key=True),
+                      Column('name', String(30)))
+        stmt = merge(self.table).using(other).\
+            on(self.table.c.id == other.c.id).\
+            when_matched_then_update(
+                {'name': bindparam('new_name')},
+                other.c.name != bindparam('old_name'))
+        binds = set()
+        visitors.traverse(stmt, {},
+                          {'bindparam': lambda b: binds.add(b.key)})
+        eq_(binds, set(['new_name', 'old_name']))
+
+        aliased = other.alias('o')
+        adapted = sql_util.ClauseAdapter(aliased).traverse(stmt)
+        self.assert_compile(
+            adapted,
+            "MERGE INTO mytable USING other AS o ON mytable.id = o.id "
+            "WHEN MATCHED AND o.name != ? THEN UPDATE SET name = ?",
+            checkpositional=('a', 'b'),
+            params={'old_name': 'a', 'new_name': 'b'})
+        # the original is left alone
+        self.assert_compile(
+            stmt,
+            "MERGE INTO mytable USING other ON mytable.id = other.id "
+            "WHEN MATCHED AND other.name != ? THEN UPDATE SET name = ?",
+            checkpositional=('a', 'b'),
+            params={'old_name': 'a', 'new_name': 'b'})
+
+    def test_merge_is_generative(self):
+        other = Table('other', MetaData(), Column('id', Integer))
+        m1 = merge(self.table).using(other).\
+            on(self.table.c.id == other.c.id)
+        m2 = m1.when_matched_then_skip()
+        eq = (len(m1._clauses), len(m2._clauses))
+        assert eq == (0, 1), eq
+
+    def test_merge_requires_clauses(self):
+        other = Table('other', MetaData(), Column('id', Integer))
+        stmt = merge(self.table).using(other).\
+            on(self.table.c.id == other.c.id)
+        assert_raises(exc.CompileError, stmt.compile,
+                      dialect=self.__dialect__)
+        assert_raises(exc.CompileError,
+                      merge(self.table).when_matched_then_skip().compile,
+                      dialect=self.__dialect__)
+
+
+class InListCompileTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect(paramstyle='qmark', in_list_threshold=3)
+
+    def setup(self):
+        self.table = Table(
+            't', MetaData(),
+            Column('id', Integer, primary_key=True),
+            Column('code', String(10)),
+            Column('amount', Numeric(10, 2)))
+
+    def test_below_threshold(self):
+        self.assert_compile(
+            self.table.c.id.in_([1, 2]),
+            "t.id IN (?, ?)",
+            checkpositional=(1, 2))
+
+    def test_threshold_not_set(self):
+        self.assert_compile(
+            self.table.c.id.in_([1, 2, 3, 4]),
+            "t.id IN (?, ?, ?, ?)",
+            dialect=base.dialect(paramstyle='qmark'))
+
+    def test_integer_list(self):
+        self.assert_compile(
+            select([self.table.c.code]).
+            where(self.table.c.id.in_(range(1000))),
+            "SELECT t.code FROM t WHERE t.id IN "
+            "(SELECT CAST(row_value AS INTEGER) FROM sa_split_list(?, ?))",
+            checkpositional=(",".join(str(i) for i in range(1000)), ","))
+
+    def test_statement_text_independent_of_size(self):
+        texts = set(
+            str(select([self.table.c.code]).
+                where(self.table.c.id.in_(range(n))).
+                compile(dialect=self.__dialect__))
+            for n in (3, 10, 10000))
+        eq_(len(texts), 1)
+
+    def test_numeric_list(self):
+        self.assert_compile(
+            self.table.c.amount.in_([decimal.Decimal('1.50'), 2, 3]),
+            "t.amount IN (SELECT CAST(row_value AS NUMERIC(10, 2)) "
+            "FROM sa_split_list(?, ?))",
+            checkpositional=("1.50,2,3", ","))
+
+    def test_not_in(self):
+        self.assert_compile(
+            ~self.table.c.id.in_([1, 2, 3]),
+            "t.id NOT IN (SELECT CAST(row_value AS INTEGER) "
+            "FROM sa_split_list(?, ?))",
+            checkpositional=("1,2,3", ","))
+
+    def test_string_list_delimiter(self):
+        self.assert_compile(
+            self.table.c.code.in_(['a', 'b', 'c']),
+            "t.code IN (SELECT row_value FROM sa_split_list(?, ?))",
+            checkpositional=("a,b,c", ","))
+        self.assert_compile(
+            self.table.c.code.in_(['a,1', 'b', 'c']),
+            "t.code IN (SELECT row_value FROM sa_split_list(?, ?))",
+            checkpositional=("a,1\x1fb\x1fc", "\x1f"))
+
+    def test_unsplittable_lists(self):
+        # NULLs, SQL expressions and unsupported types keep a plain IN
+        self.assert_compile(
+            self.table.c.id.in_([1, 2, None]),
+            "t.id IN (?, ?, NULL)")
+        self.assert_compile(
+            self.table.c.id.in_([1, 2, self.table.c.amount]),
+            "t.id IN (?, ?, t.amount)")
+        d = Table('d', MetaData(), Column('x', Date))
+        self.assert_compile(
+            d.c.x.in_([datetime.date(2020, 1, i) for i in (1, 2, 3)]),
+            "d.x IN (?, ?, ?)")
+
+    def test_literal_binds(self):
+        self.assert_compile(
+            self.table.c.id.in_([1, 2, 3]),
+            "t.id IN (1, 2, 3)",
+            literal_binds=True)
+
+    def test_bind_processors_applied(self):
+        class Cents(TypeDecorator):
+            impl = Integer
+
+            def process_bind_param(self, value, dialect):
+                return value * 100
+
+        t = Table('p', MetaData(), Column('price', Cents))
+        self.assert_compile(
+            t.c.price.in_([1, 2, 3, 4]),
+            "p.price IN (SELECT CAST(row_value AS INTEGER) "
+            "FROM sa_split_list(?, ?))",
+            checkpositional=("100,200,300,400", ","))
+
+    def test_unscaled_numeric_not_split(self):
+        # CAST(row_value AS NUMERIC) would round to the server's default
+        # scale
+        t = Table('n', MetaData(), Column('x', Numeric),
+                  Column('y', Numeric(10)))
+        values = [decimal.Decimal('1.125'), 2, 3]
+        self.assert_compile(t.c.x.in_(values), "n.x IN (?, ?, ?)")
+        self.assert_compile(t.c.y.in_(values), "n.y IN (?, ?, ?)")
+
+    def test_expanding_not_split(self):
+        self.assert_compile(
+            self.table.c.id.in_(bindparam('ids', expanding=True)),
+            "t.id IN ([EXPANDING_ids])")
+
+
+class IndexDDLTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect()
+
+    def setup(self):
+        self.table = Table('t', MetaData(),
+                           Column('a', Integer), Column('b', String(20)),
+                           schema='app')
+
+    def test_plain(self):
+        t = self.table
+        self.assert_compile(CreateIndex(Index('ix_a', t.c.a)),
+                            "CREATE INDEX ix_a ON app.t (a)")
+
+    def test_descending(self):
+        t = self.table
+        self.assert_compile(
+            CreateIndex(Index('ix_ab', t.c.a, t.c.b.desc())),
+            "CREATE INDEX ix_ab ON app.t (a, b DESC)")
+
+    def test_clustered_unique_dbspace(self):
+        t = self.table
+        idx = Index('ix_a', t.c.a.desc(), unique=True,
+                    sqlany_clustered=True, sqlany_dbspace='fast space')
+        self.assert_compile(
+            CreateIndex(idx),
+            'CREATE UNIQUE CLUSTERED INDEX ix_a ON app.t (a DESC) '
+            'IN "fast space"')
+
+    def test_virtual(self):
+        t = self.table
+        self.assert_compile(
+            CreateIndex(Index('ix_b', t.c.b, sqlany_virtual=True)),
+            "CREATE VIRTUAL INDEX ix_b ON app.t (b)")
+
+    def test_unknown_option(self):
+        assert_raises(exc.ArgumentError, Index, 'ix', self.table.c.a,
+                      sqlany_bogus=True)
+
+
+class TableOptionsDDLTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect()
+
+    def test_pctfree_and_dbspace(self):
+        t = Table('t', MetaData(),
+                  Column('id', Integer, primary_key=True),
+                  sqlany_pctfree=10, sqlany_dbspace='hot')
+        self.assert_compile(
+            CreateTable(t),
+            "CREATE TABLE t (id INTEGER IDENTITY, "
+            "PRIMARY KEY (id), PCTFREE 10) IN hot")
+
+    def test_pctfree_without_constraints(self):
+        t = Table('t', MetaData(), Column('x', Integer),
+                  sqlany_pctfree=0)
+        self.assert_compile(CreateTable(t),
+                            "CREATE TABLE t (x INTEGER NULL, PCTFREE 0)")
+
+    def test_clustered_primary_key(self):
+        t = Table('t', MetaData(),
+                  Column('a', Integer, autoincrement=False),
+                  Column('b', Integer),
+                  PrimaryKeyConstraint('a', 'b', name='pk_t',
+                                       sqlany_clustered=True))
+        self.assert_compile(
+            CreateTable(t),
+            "CREATE TABLE t (a INTEGER NOT NULL, b INTEGER NOT NULL, "
+            "CONSTRAINT pk_t PRIMARY KEY CLUSTERED (a, b))")
+
+    def test_clustered_primary_key_unnamed(self):
+        t = Table('t', MetaData(),
+                  Column('a', Integer, autoincrement=False),
+                  PrimaryKeyConstraint('a', sqlany_clustered=True,
+                                       initially='DEFERRED'))
+        self.assert_compile(
+            CreateTable(t),
+            "CREATE TABLE t (a INTEGER NOT NULL, "
+            "PRIMARY KEY CLUSTERED (a) INITIALLY DEFERRED)")
+
+    def test_column_storage(self):
+        t = Table('t', MetaData(),
+                  Column('doc', LargeBinary, sqlany_compressed=True,
+                         sqlany_inline=256, sqlany_prefix=8),
+                  Column('note', String(100), sqlany_compressed=True))
+        self.assert_compile(
+            CreateTable(t),
+            "CREATE TABLE t (doc IMAGE COMPRESSED INLINE 256 PREFIX 8 "
+            "NULL, note VARCHAR(100) COMPRESSED NULL)")
+
+
+class SequenceCompileTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect(paramstyle='qmark')
+
+    def test_create_drop(self):
+        seq = Sequence('order_seq', start=1000, increment=50, schema='app')
+        self.assert_compile(
+            CreateSequence(seq),
+            "CREATE SEQUENCE app.order_seq INCREMENT BY 50 START WITH 1000")
+        self.assert_compile(DropSequence(seq), "DROP SEQUENCE app.order_seq")
+
+    def test_next_value(self):
+        self.assert_compile(select([Sequence('s').next_value()]),
+                            "SELECT s.nextval AS next_value_1")
+
+    def test_identity_column(self):
+        t = Table('t', MetaData(), Column('id', Integer, primary_key=True))
+        self.assert_compile(
+            CreateTable(t),
+            "CREATE TABLE t (id INTEGER IDENTITY, PRIMARY KEY (id))")
+
+    def test_optional_sequence_is_identity(self):
+        t = Table('t', MetaData(),
+                  Column('id', Integer, Sequence('s', optional=True),
+                         primary_key=True),
+                  Column('x', Integer))
+        self.assert_compile(
+            CreateTable(t),
+            "CREATE TABLE t (id INTEGER IDENTITY, x INTEGER NULL, "
+            "PRIMARY KEY (id))")
+        self.assert_compile(t.insert().values(x=5),
+                            "INSERT INTO t (x) VALUES (?)")
+
+    def test_sequence_column(self):
+        t = Table('t', MetaData(),
+                  Column('id', Integer, Sequence('s', start=100),
+                         primary_key=True),
+                  Column('x', Integer))
+        self.assert_compile(
+            CreateTable(t),
+            "CREATE TABLE t (id INTEGER NOT NULL, x INTEGER NULL, "
+            "PRIMARY KEY (id))")
+        self.assert_compile(t.insert().values(x=5),
+                            "INSERT INTO t (id, x) VALUES (s.nextval, ?)")
+
+
+class PaginationCompileTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect(paramstyle='qmark')
+
+    def setup(self):
+        m = MetaData()
+        self.t = Table('t', m, Column('id', Integer, primary_key=True),
+                       Column('x', String(10)))
+        self.u = Table('u', m, Column('id', Integer, primary_key=True),
+                       Column('x', String(10)))
+
+    def test_integer_limit_offset(self):
+        t = self.t
+        self.assert_compile(
+            select([t]).order_by(t.c.x).limit(5).offset(10),
+            "SELECT TOP 5 START AT 11 t.id, t.x FROM t ORDER BY t.x")
+
+    def test_integer_limit_in_subquery(self):
+        t, u = self.t, self.u
+        self.assert_compile(
+            select([t.c.id]).where(
+                t.c.id.in_(select([u.c.id]).order_by(u.c.x).limit(3))),
+            "SELECT t.id FROM t WHERE t.id IN "
+            "(SELECT TOP 3 u.id FROM u ORDER BY u.x)")
+
+    def test_bound_limit_offset(self):
+        t = self.t
+        self.assert_compile(
+            select([t]).order_by(t.c.x).
+            limit(bindparam('l')).offset(bindparam('o')),
+            "SELECT anon_1.id, anon_1.x FROM (SELECT t.id AS id, t.x AS x, "
+            "ROW_NUMBER() OVER (ORDER BY t.x) AS sqlany_rn FROM t) AS anon_1 "
+            "WHERE anon_1.sqlany_rn > ? AND anon_1.sqlany_rn - ? <= ? "
+            "ORDER BY anon_1.sqlany_rn",
+            checkpositional=(10, 10, 5),
+            params={'l': 5, 'o': 10})
+
+    def test_bound_limit_in_subquery(self):
+        t = self.t
+        sub = select([t.c.id]).order_by(t.c.x).\
+            limit(bindparam('n')).alias('s')
+        # no ORDER BY, which is only allowed at the top
+        self.assert_compile(
+            select([sub.c.id]),
+            "SELECT s.id FROM (SELECT anon_1.id AS id FROM "
+            "(SELECT t.id AS id, ROW_NUMBER() OVER (ORDER BY t.x) "
+            "AS sqlany_rn FROM t) AS anon_1 "
+            "WHERE anon_1.sqlany_rn <= ?) AS s",
+            checkpositional=(4,),
+            params={'n': 4})
+
+    def test_limit_offset_of_union(self):
+        t, u = self.t, self.u
+        self.assert_compile(
+            union(select([t.c.id]), select([u.c.id])).
+            order_by('id').limit(3).offset(2),
+            "SELECT anon_1.id FROM (SELECT anon_2.id AS id, "
+            "ROW_NUMBER() OVER (ORDER BY anon_2.id) AS sqlany_rn FROM "
+            "(SELECT t.id AS id FROM t UNION SELECT u.id AS id FROM u) "
+            "AS anon_2) AS anon_1 "
+            "WHERE anon_1.sqlany_rn > ? AND anon_1.sqlany_rn - ? <= ? "
+            "ORDER BY anon_1.sqlany_rn",
+            checkpositional=(2, 2, 3))
+
+    def test_limits_in_union(self):
+        t = self.t
+        s1 = select([t]).where(t.c.id == 2).limit(1).order_by(t.c.id)
+        s2 = select([t]).where(t.c.id == 3).limit(1).order_by(t.c.id)
+        u1 = union(s1, s2).limit(2)
+        self.assert_compile(
+            u1.order_by(u1.c.id),
+            "SELECT anon_1.id, anon_1.x FROM (SELECT anon_2.id AS id, "
+            "anon_2.x AS x, ROW_NUMBER() OVER (ORDER BY anon_2.id) "
+            "AS sqlany_rn FROM ("
+            "(SELECT anon_3.id, anon_3.x FROM (SELECT t.id AS id, t.x AS x, "
+            "ROW_NUMBER() OVER (ORDER BY t.id) AS sqlany_rn FROM t "
+            "WHERE t.id = ?) AS anon_3 WHERE anon_3.sqlany_rn <= ?) UNION "
+            "(SELECT anon_4.id, anon_4.x FROM (SELECT t.id AS id, t.x AS x, "
+            "ROW_NUMBER() OVER (ORDER BY t.id) AS sqlany_rn FROM t "
+            "WHERE t.id = ?) AS anon_4 WHERE anon_4.sqlany_rn <= ?)"
+            ") AS anon_2) AS anon_1 WHERE anon_1.sqlany_rn <= ? "
+            "ORDER BY anon_1.sqlany_rn",
+            checkpositional=(2, 1, 3, 1, 2))
+
+    def test_row_number_requires_order_by(self):
+        t = self.t
+        u = union(select([t]).where(t.c.id == 2).limit(1),
+                  select([t]).where(t.c.id == 3).limit(1))
+        for stmt in (select([t]).limit(bindparam('n')),
+                     select([t]).offset(bindparam('n')),
+                     union(select([t]), select([t])).limit(3),
+                     u):
+            assert_raises_message(
+                exc.CompileError, "requires an order_by",
+                stmt.compile, dialect=self.__dialect__)
+        # TOP and START AT don't need one
+        self.assert_compile(
+            select([t.c.id]).limit(3).offset(2),
+            "SELECT TOP 3 START AT 3 t.id FROM t")
+
+    def test_result_columns_of_wrapped_select(self):
+        t = self.t
+        compiled = select([t]).order_by(t.c.x).limit(bindparam('l')).\
+            compile(dialect=self.__dialect__)
+        eq_([name for key, name, objects, type_
+             in compiled._result_columns], ['id', 'x'])
+        assert t.c.id in compiled._result_columns[0][2]
+
+
+class FullTextCompileTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect(paramstyle='qmark')
+
+    def setup(self):
+        self.docs = Table('docs', MetaData(),
+                          Column('id', Integer, primary_key=True),
+                          Column('title', String(100)),
+                          Column('body', Text),
+                          schema='app')
+
+    def test_create_text_index(self):
+        d = self.docs
+        self.assert_compile(
+            CreateIndex(Index('tx_docs', d.c.title, d.c.body,
+                              sqlany_text=True)),
+            "CREATE TEXT INDEX tx_docs ON app.docs (title, body)")
+
+    def test_create_text_index_options(self):
+        d = self.docs
+        idx = Index('tx_docs', d.c.body, sqlany_text=True,
+                    sqlany_text_configuration='myconfig',
+                    sqlany_text_refresh='auto every 2 hours',
+                    sqlany_dbspace='text_space')
+        self.assert_compile(
+            CreateIndex(idx),
+            "CREATE TEXT INDEX tx_docs ON app.docs (body) IN text_space "
+            "CONFIGURATION myconfig AUTO REFRESH EVERY 2 HOURS")
+        idx = Index('tx_docs', d.c.body, sqlany_text=True,
+                    sqlany_text_refresh='manual')
+        self.assert_compile(
+            CreateIndex(idx),
+            "CREATE TEXT INDEX tx_docs ON app.docs (body) MANUAL REFRESH")
+
+    def test_text_index_refresh_normalized(self):
+        d = self.docs
+        for refresh, ddl in [
+                ('auto every 120 minutes', "AUTO REFRESH EVERY 2 HOURS"),
+                ('Auto  Every 1 hour', "AUTO REFRESH EVERY 1 HOURS"),
+                ('auto every 90 minutes', "AUTO REFRESH EVERY 90 MINUTES"),
+                ('IMMEDIATE', "IMMEDIATE REFRESH")]:
+            idx = Index('tx_docs', d.c.body, sqlany_text=True,
+                        sqlany_text_refresh=refresh)
+            self.assert_compile(
+                CreateIndex(idx),
+                "CREATE TEXT INDEX tx_docs ON app.docs (body) " + ddl)
+        for refresh in ('manual every 2 hours', 'every 2 hours', 'auto 5'):
+            idx = Index('tx_docs', d.c.body, sqlany_text=True,
+                        sqlany_text_refresh=refresh)
+            assert_raises_message(
+                exc.CompileError, "sqlany_text_refresh must be",
+                CreateIndex(idx).compile, dialect=self.__dialect__)
+
+    def test_drop_text_index(self):
+        d = self.docs
+        self.assert_compile(
+            DropIndex(Index('tx_docs', d.c.body, sqlany_text=True)),
+            "DROP TEXT INDEX tx_docs ON app.docs")
+        self.assert_compile(DropIndex(Index('ix_docs', d.c.title)),
+                            'DROP INDEX "docs".ix_docs')
+
+    def test_contains(self):
+        d = self.docs
+        self.assert_compile(
+            select([d.c.id]).where(contains(d.c.body, 'cluster*')),
+            "SELECT app.docs.id FROM app.docs "
+            "WHERE CONTAINS(app.docs.body, ?)",
+            checkpositional=('cluster*',))
+
+    def test_contains_columns_and_alias(self):
+        d = self.docs.alias('d')
+        stmt = select([d.c.id]).where(
+            contains([d.c.title, d.c.body], bindparam('q'))).\
+            where(d.c.id > 5)
+        self.assert_compile(
+            stmt,
+            "SELECT d.id FROM app.docs AS d "
+            "WHERE CONTAINS(d.title, d.body, ?) AND d.id > ?")
+        self.assert_compile(
+            select([d.c.id]).where(~contains(d.c.body, 'draft')),
+            "SELECT d.id FROM app.docs AS d "
+            "WHERE NOT CONTAINS(d.body, ?)")
+
+
+class MaterializedViewDDLTest(fixtures.TestBase, AssertsCompiledSQL):
+    __dialect__ = base.dialect()
+
+    def setup(self):
+        self.orders = Table('orders', MetaData(),
+                            Column('id', Integer, primary_key=True),
+                            Column('customer_id', Integer),
+                            Column('amount', Numeric(10, 2)))
+
+    def test_create(self):
+        o = self.orders
+        stmt = select([o.c.customer_id,
+                       func.sum(o.c.amount).label('total')]).\
+            where(o.c.amount > 0).group_by(o.c.customer_id)
+        self.assert_compile(
+            CreateMaterializedView('order_totals', stmt, schema='rpt',
+                                   dbspace='mv'),
+            "CREATE MATERIALIZED VIEW rpt.order_totals IN mv AS "
+            "SELECT orders.customer_id, sum(orders.amount) AS total "
+            "FROM orders WHERE orders.amount > 0 "
+            "GROUP BY orders.customer_id")
+
+    def test_refresh(self):
+        self.assert_compile(RefreshMaterializedView('order_totals'),
+                            "REFRESH MATERIALIZED VIEW order_totals")
+        self.assert_compile(
+            RefreshMaterializedView('order_totals',
+                                    isolation_level='snapshot',
+                                    force_build=True),
+            "REFRESH MATERIALIZED VIEW order_totals "
+            "WITH ISOLATION LEVEL snapshot FORCE BUILD")
+
+    def test_alter_and_drop(self):
+        self.assert_compile(
+            AlterMaterializedView('order_totals', 'immediate'),
+            "ALTER MATERIALIZED VIEW order_totals IMMEDIATE REFRESH")
+        self.assert_compile(
+            DropMaterializedView('Order Totals', schema='rpt'),
+            'DROP MATERIALIZED VIEW rpt."Order Totals"')
+        assert_raises(exc.ArgumentError, AlterMaterializedView, 'v', 'auto')
@@ -0,0 +1,45 @@
+import threading
+
+from sqlalchemy.testing import eq_, fixtures
+
+from . import stress
+from .fakedbapi import FakeDBAPI
+
+
+class StressTest(fixtures.TestBase):
+    """A short run of the concurrency stress test; the full one, with the
+    scaling figures, is ``python -m test.stress``."""
+
+    def test_threads(self):
+        operations, elapsed, errors = stress.run_threads(8, 20)
+        eq_(operations, 160)
+        eq_(errors, [])
+
+    def test_threads_latency(self):
+        # with latency, threads overlap inside the driver
+        operations, elapsed, errors = stress.run_threads(4, 8,
+                                                         latency=0.001)
+        eq_(errors, [])
+
+    def test_shared_connection_detected(self):
+        dbapi = FakeDBAPI()
+        dbapi.latency = 0.01
+        dbapi.add_result(r"^SELECT 1", [(1,)], columns=('x',))
+        conn = dbapi.connect()
+        barrier = threading.Barrier(2)
+
+        def work():
+            barrier.wait()
+            conn.cursor().execute("SELECT 1")
+
+        threads = [threading.Thread(target=work) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        eq_(len(dbapi.violations), 1)
+
+    def test_scaling(self):
+        eq_(stress.scaling([(1, 100, 1.0), (2, 200, 1.0), (4, 300, 1.0)]),
+            [(1, 100.0, 1.0, None), (2, 200.0, 2.0, 1.0),
+             (4, 300.0, 3.0, 0.5)])
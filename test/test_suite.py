@@ -2,7 +2,6 @@ from sqlalchemy.testing.suite import *
 
 from sqlalchemy.testing.suite import ComponentReflectionTest as _ComponentReflectionTest
 from sqlalchemy.testing.suite import InsertBehaviorTest as _InsertBehaviorTest
-from sqlalchemy.testing.suite import LimitOffsetTest as _LimitOffsetTest
 from sqlalchemy.testing.suite import RowFetchTest as _RowFetchTest
 from sqlalchemy.testing.suite import TextTest as _TextTest
 from sqlalchemy.testing.suite import UnicodeTextTest as _UnicodeTextTest
@@ -44,14 +43,6 @@ class InsertBehaviorTest(_InsertBehaviorTest):
     def test_insert_from_select_with_defaults( self ):
         pass
 
-class LimitOffsetTest(_LimitOffsetTest):
-    def test_bound_limit( self ):
-        pass
-    def test_bound_limit_offset( self ):
-        pass
-    def test_bound_offset( self ):
-        pass
-
 class RowFetchTest(_RowFetchTest):
     def test_row_w_scalar_select(self):
         pass